@@ -66,7 +66,7 @@ def get_auth_endpoints():
         from shared.auth.jwt_service import JWTService
         from shared.config.config_manager import ConfigManager
         from shared.auth.database_user_store import DatabaseUserStore
-        from shared.database.connection_manager import DatabaseConnectionManager
+        from shared.database.connection_manager import get_shared_connection_manager
 
         config = ConfigManager()
         jwt_service = JWTService(
@@ -76,7 +76,7 @@ def get_auth_endpoints():
             refresh_token_expire_hours=24
         )
 
-        db_manager = DatabaseConnectionManager(config)
+        db_manager = get_shared_connection_manager(config)
         user_store = DatabaseUserStore(db_manager)
 
         return AuthEndpoints(
@@ -13,7 +13,7 @@ from pydantic import BaseModel
 
 from shared.config.config_manager import ConfigManager
 from shared.network.service_resolver import ServiceResolver
-from shared.database.connection_manager import DatabaseConnectionManager
+from shared.database.connection_manager import get_shared_connection_manager
 from storage_client import StorageClient
 
 
@@ -62,14 +62,11 @@ service_resolver = ServiceResolver(config_manager)
 service_discovery = ServiceResolverAdapter(service_resolver, config_manager)
 storage_client = StorageClient(config_adapter, service_discovery)
 
-# Database manager for metadata sync
-_db_manager = DatabaseConnectionManager(config_manager)
-
 # Get default system user for storage operations
 async def _get_system_user_id() -> str:
     """Get an admin user to use as default owner for storage operations."""
     try:
-        async with _db_manager.acquire() as conn:
+        async with get_shared_connection_manager(config_manager).acquire() as conn:
             # Try to get an admin user
             user_id = await conn.fetchval(
                 "SELECT id FROM users WHERE role = 'ADMIN' LIMIT 1"
@@ -102,7 +99,7 @@ async def _sync_bucket_to_db(bucket_name: str, owner_id: str, public: bool = Fal
     """Insert or update bucket metadata in database to trigger pg_notify."""
     try:
         bucket_id = str(uuid.uuid4())
-        async with _db_manager.acquire() as conn:
+        async with get_shared_connection_manager(config_manager).acquire() as conn:
             # Check if bucket already exists
             existing_id = await conn.fetchval(
                 "SELECT id FROM buckets WHERE name = $1", 
@@ -135,7 +132,7 @@ async def _sync_bucket_to_db(bucket_name: str, owner_id: str, public: bool = Fal
 async def _delete_bucket_from_db(bucket_name: str) -> None:
     """Delete bucket metadata from database to trigger pg_notify."""
     try:
-        async with _db_manager.acquire() as conn:
+        async with get_shared_connection_manager(config_manager).acquire() as conn:
             result = await conn.execute(
                 "DELETE FROM buckets WHERE name = $1", 
                 bucket_name
@@ -153,7 +150,7 @@ async def _delete_bucket_from_db(bucket_name: str) -> None:
 async def list_buckets():
     """List all buckets from database for real-time updates."""
     try:
-        async with _db_manager.acquire() as conn:
+        async with get_shared_connection_manager(config_manager).acquire() as conn:
             rows = await conn.fetch("""
                 SELECT 
                     b.id,
@@ -243,7 +240,7 @@ async def create_bucket(payload: BucketCreate):
 async def get_bucket(bucket: str):
     """Get bucket details from database for real-time updates."""
     try:
-        async with _db_manager.acquire() as conn:
+        async with get_shared_connection_manager(config_manager).acquire() as conn:
             row = await conn.fetchrow("""
                 SELECT 
                     b.id,
@@ -344,7 +341,7 @@ async def update_bucket(bucket: str, payload: BucketUpdate):
 async def list_bucket_files(bucket: str):
     """List files in a bucket from database for real-time updates."""
     try:
-        async with _db_manager.acquire() as conn:
+        async with get_shared_connection_manager(config_manager).acquire() as conn:
             # Get bucket ID first
             bucket_id = await conn.fetchval(
                 "SELECT id FROM buckets WHERE name = $1", 
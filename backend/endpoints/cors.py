@@ -13,7 +13,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status, Request, R
 from pydantic import BaseModel, Field, ConfigDict
 
 from shared.config.config_manager import ConfigManager
-from shared.database.connection_manager import DatabaseConnectionManager
+from shared.database.connection_manager import get_shared_connection_manager
 from shared.services.cors_origin_crud_manager import (
     CorsOriginCRUDManager,
     CorsOriginNotFoundError,
@@ -39,7 +39,7 @@ def get_auth_endpoints():
         from shared.auth.jwt_service import JWTService
         from shared.config.config_manager import ConfigManager
         from shared.auth.database_user_store import DatabaseUserStore
-        from shared.database.connection_manager import DatabaseConnectionManager
+        from shared.database.connection_manager import get_shared_connection_manager
 
         config = ConfigManager()
         jwt_service = JWTService(
@@ -49,7 +49,7 @@ def get_auth_endpoints():
             refresh_token_expire_hours=24
         )
         
-        db_manager = DatabaseConnectionManager(config)
+        db_manager = get_shared_connection_manager(config)
         user_store = DatabaseUserStore(db_manager)
         
         return AuthEndpoints(
@@ -60,8 +60,7 @@ def get_auth_endpoints():
 
 try:
     _config_manager = ConfigManager()
-    _db_manager = DatabaseConnectionManager(_config_manager)
-    cors_crud_manager = CorsOriginCRUDManager(_db_manager)
+    cors_crud_manager = CorsOriginCRUDManager(get_shared_connection_manager(_config_manager))
     
     # Initialize JWT service for admin access control
     jwt_service = JWTService(
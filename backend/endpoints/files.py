@@ -14,7 +14,7 @@ from datetime import datetime
 # Import existing components  
 from shared.config.config_manager import ConfigManager
 from shared.network.service_resolver import ServiceResolver
-from shared.database.connection_manager import DatabaseConnectionManager
+from shared.database.connection_manager import get_shared_connection_manager
 from file_handlers import FileUploadProxy, FileDownloadProxy
 from storage_client import StorageClient
 
@@ -42,6 +42,7 @@ class ConfigAdapter:
             
             # Download configuration
             "download_timeout": 600.0,  # 10 minutes for large files
+            "buffer_size": 128 * 1024,  # Read buffer for buffered downloads
             
             # Upload configuration  
             "upload_timeout": 600.0,    # 10 minutes for large files
@@ -104,14 +105,11 @@ upload_proxy = FileUploadProxy(config_adapter, auth_adapter)
 download_proxy = FileDownloadProxy(config_adapter, auth_adapter)
 storage_client = StorageClient(config_adapter, service_discovery)
 
-# Database manager for metadata sync
-_db_manager = DatabaseConnectionManager(config_manager)
-
 # Get default system user for storage operations
 async def _get_system_user_id() -> str:
     """Get an admin user to use as default owner for storage operations."""
     try:
-        async with _db_manager.acquire() as conn:
+        async with get_shared_connection_manager(config_manager).acquire() as conn:
             # Try to get an admin user
             user_id = await conn.fetchval(
                 "SELECT id FROM users WHERE role = 'ADMIN' LIMIT 1"
@@ -133,7 +131,7 @@ async def _get_system_user_id() -> str:
 async def _sync_file_to_db(bucket_name: str, file_path: str, file_size: int, content_type: str, owner_id: str) -> None:
     """Insert file metadata to database to trigger pg_notify."""
     try:
-        async with _db_manager.acquire() as conn:
+        async with get_shared_connection_manager(config_manager).acquire() as conn:
             # Get bucket_id from bucket name
             bucket_id = await conn.fetchval("SELECT id FROM buckets WHERE name = $1", bucket_name)
             if not bucket_id:
@@ -173,7 +171,7 @@ async def _sync_file_to_db(bucket_name: str, file_path: str, file_size: int, con
 async def _delete_file_from_db(bucket_name: str, file_path: str) -> None:
     """Delete file metadata from database to trigger pg_notify."""
     try:
-        async with _db_manager.acquire() as conn:
+        async with get_shared_connection_manager(config_manager).acquire() as conn:
             bucket_id = await conn.fetchval("SELECT id FROM buckets WHERE name = $1", bucket_name)
             if bucket_id:
                 result = await conn.execute(
@@ -14,7 +14,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status, Request, R
 from pydantic import BaseModel, Field, ConfigDict
 
 from shared.config.config_manager import ConfigManager
-from shared.database.connection_manager import DatabaseConnectionManager
+from shared.database.connection_manager import get_shared_connection_manager
 from shared.services.function_crud_manager import (
     FunctionCRUDManager,
     FunctionNotFoundError,
@@ -34,12 +34,11 @@ router = APIRouter(prefix="/api/v1", tags=["functions"])
 
 try:
     _config_manager = ConfigManager()
-    _db_manager = DatabaseConnectionManager(_config_manager)
-    function_crud_manager = FunctionCRUDManager(_db_manager)
+    function_crud_manager = FunctionCRUDManager(get_shared_connection_manager(_config_manager))
     function_deployment_manager = FunctionDeploymentManager()
-    function_log_crud_manager = FunctionLogCRUDManager(_db_manager)
-    function_execution_crud_manager = FunctionExecutionCRUDManager(_db_manager)
-    webhook_delivery_crud_manager = WebhookDeliveryCRUDManager(_db_manager)
+    function_log_crud_manager = FunctionLogCRUDManager(get_shared_connection_manager(_config_manager))
+    function_execution_crud_manager = FunctionExecutionCRUDManager(get_shared_connection_manager(_config_manager))
+    webhook_delivery_crud_manager = WebhookDeliveryCRUDManager(get_shared_connection_manager(_config_manager))
 except Exception as exc:
     logger.warning("Failed to initialize CRUD managers: %s", exc)
     function_crud_manager = None
@@ -12,7 +12,7 @@ from shared.services.sql_service import (
     SqlSnippet,
     SecurityError,
 )
-from shared.database.connection_manager import DatabaseConnectionManager
+from shared.database.connection_manager import get_shared_connection_manager
 from shared.config.config_manager import ConfigManager
 
 logger = logging.getLogger(__name__)
@@ -66,8 +66,7 @@ async def get_current_admin_user(request: Request) -> Dict[str, Any]:
 # Initialize service (following tables.py pattern)
 try:
     _config_manager = ConfigManager()
-    _db_manager = DatabaseConnectionManager(_config_manager)
-    sql_service = SqlService(_db_manager)
+    sql_service = SqlService(get_shared_connection_manager(_config_manager))
 except Exception as exc:
     logger.warning("Failed to initialize SqlService: %s", exc)
     sql_service = None
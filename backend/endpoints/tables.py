@@ -14,7 +14,7 @@ except ImportError:
     asyncpg = None
 
 from shared.config.config_manager import ConfigManager
-from shared.database.connection_manager import DatabaseConnectionManager
+from shared.database.connection_manager import get_shared_connection_manager
 from shared.services.table_crud_manager import (
     TableAlreadyExistsError,
     TableCRUDManager,
@@ -28,8 +28,7 @@ router = APIRouter(prefix="/api/v1", tags=["tables"])
 
 try:
     _config_manager = ConfigManager()
-    _db_manager = DatabaseConnectionManager(_config_manager)
-    table_crud_manager = TableCRUDManager(_db_manager)
+    table_crud_manager = TableCRUDManager(get_shared_connection_manager(_config_manager))
 except Exception as exc:  # pragma: no cover - initialization fallback for tests
     logger.warning("Failed to initialize TableCRUDManager: %s", exc)
     table_crud_manager = None
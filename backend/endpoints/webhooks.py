@@ -14,7 +14,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status, Request, R
 from pydantic import BaseModel, Field, ConfigDict
 
 from shared.config.config_manager import ConfigManager
-from shared.database.connection_manager import DatabaseConnectionManager
+from shared.database.connection_manager import get_shared_connection_manager
 from shared.services.webhook_crud_manager import (
     WebhookCRUDManager,
     WebhookNotFoundError,
@@ -30,9 +30,8 @@ router = APIRouter(prefix="/api/v1", tags=["webhooks"])
 
 try:
     _config_manager = ConfigManager()
-    _db_manager = DatabaseConnectionManager(_config_manager)
-    webhook_crud_manager = WebhookCRUDManager(_db_manager)
-    webhook_delivery_crud_manager = WebhookDeliveryCRUDManager(_db_manager)
+    webhook_crud_manager = WebhookCRUDManager(get_shared_connection_manager(_config_manager))
+    webhook_delivery_crud_manager = WebhookDeliveryCRUDManager(get_shared_connection_manager(_config_manager))
 except Exception as exc:
     logger.warning("Failed to initialize webhook CRUD managers: %s", exc)
     webhook_crud_manager = None
@@ -844,10 +843,10 @@ async def ingest_webhook(
         try:
             from shared.services.function_crud_manager import FunctionCRUDManager
             from shared.config.config_manager import ConfigManager
-            from shared.database.connection_manager import DatabaseConnectionManager
+            from shared.database.connection_manager import get_shared_connection_manager
             
             config_manager = ConfigManager()
-            db_manager = DatabaseConnectionManager(config_manager)
+            db_manager = get_shared_connection_manager(config_manager)
             function_crud_manager_temp = FunctionCRUDManager(db_manager)
             
             function = await function_crud_manager_temp.get_function(func_id)
@@ -8,13 +8,24 @@ Supports single-part uploads, multipart uploads, streaming, progress tracking, a
 import httpx
 import urllib.parse
 import asyncio
+import os
 import time
 import math
-from typing import Dict, Any, Optional, Callable, AsyncIterator
+import re
+import tempfile
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, AsyncIterator, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Anything that makes a storage path unsafe: traversal, absolute paths, NUL or
+# unencoded spaces, and segments named after Windows reserved devices
+_INVALID_PATH_RE = re.compile(
+    r"\.\.|\A/|[\x00 ]|(?:\A|/)(?:CON|PRN|AUX|NUL|COM[1-9]|LPT[1-9])(?:[./]|\Z)",
+    re.IGNORECASE
+)
+
 
 class FileUploadProxy:
     """
@@ -502,23 +513,44 @@ class FileDownloadProxy:
         
         # Configuration settings
         self._download_timeout = config_manager.get_setting("download_timeout")
-        self._buffer_size = 8192  # 8KB buffer for streaming
+        # Read buffer: 128KB unless configured, never below 64KB
+        buffer_size = config_manager.get_setting("buffer_size")
+        self._buffer_size = max(buffer_size if isinstance(buffer_size, int) else 128 * 1024, 64 * 1024)
         self._max_concurrent_downloads = 10
+        self._progress_interval = 0.05  # Minimum seconds between progress callbacks
+        
+        # Connection pool settings for the shared storage client
+        self._max_connections = 100
+        self._max_keepalive_connections = 50
+        self._keepalive_expiry = 30.0  # Seconds an idle connection is kept
+        
+        # Short-lived HEAD results, keyed by bucket, path and forwarded headers
+        self._meta_cache: "OrderedDict[Tuple, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._meta_cache_size = 1024
+        self._meta_cache_ttl = 1.0  # Seconds a metadata entry stays fresh
+        
+        # Lowercased request headers that may be forwarded to storage
+        self._forward_headers = frozenset({
+            "authorization", "x-api-key", "x-user-id",
+            "if-none-match", "if-modified-since", "range",
+            "accept", "accept-encoding"
+        })
         
-        # Initialize HTTP client
+        # Initialize HTTP client, shared by every download method
         self._http_client = self._create_http_client()
         
         logger.info("FileDownloadProxy initialized successfully")
     
     def _create_http_client(self) -> httpx.AsyncClient:
-        """Create optimized HTTP client for download operations."""
+        """Create pooled HTTP client for download operations."""
         limits = httpx.Limits(
-            max_connections=20,
-            max_keepalive_connections=10
+            max_connections=self._max_connections,
+            max_keepalive_connections=self._max_keepalive_connections,
+            keepalive_expiry=self._keepalive_expiry
         )
         
         timeout = httpx.Timeout(
-            connect=10.0,
+            connect=5.0,    # Storage is an internal service
             read=float(self._download_timeout),
             write=30.0,
             pool=10.0
@@ -636,7 +668,8 @@ class FileDownloadProxy:
                         response_metadata["content_type"] = response.headers.get("Content-Type", "application/octet-stream")
                         response_metadata["content_length"] = response.headers.get("Content-Length")
                         
-                        async for chunk in response.aiter_bytes(chunk_size=self._buffer_size):
+                        # Forward chunks as they arrive rather than re-packing them
+                        async for chunk in response.aiter_bytes():
                             yield chunk
                     else:
                         # Handle error in streaming context
@@ -730,14 +763,96 @@ class FileDownloadProxy:
                 "error_message": str(e)
             }
     
-    async def get_file_metadata(self, bucket: str, path: str, auth_headers: Dict[str, str]) -> Dict[str, Any]:
+    async def download_file_parallel(self, bucket: str, path: str, auth_headers: Dict[str, str],
+                                     num_parts: int = 8) -> Dict[str, Any]:
+        """
+        Download a file as concurrent byte-range requests.
+        
+        Size and ETag come from a fresh HEAD and every range carries
+        If-Range, so a file replaced mid-download is never stitched
+        together from two versions. Falls back to a single GET when the
+        storage service does not advertise byte ranges, the file has no
+        strong ETag or is too small to split, or any range comes back
+        whole or short.
+        
+        Args:
+            bucket: Storage bucket name
+            path: File path within bucket
+            auth_headers: Authentication headers to forward
+            num_parts: Number of ranges to fetch, capped by max_concurrent_downloads
+            
+        Returns:
+            Download result with content, content_type, size, etc.
+        """
+        try:
+            metadata = await self.get_file_metadata(bucket, path, auth_headers, fresh=True)
+            total_size = metadata.get("size", 0)
+            etag = metadata.get("etag")
+            num_parts = min(num_parts, self._max_concurrent_downloads, total_size)
+            
+            # If-Range only accepts strong validators
+            if (metadata.get("status") != "found" or metadata.get("accept_ranges") != "bytes"
+                    or not etag or etag.startswith("W/") or num_parts < 2):
+                return await self.download_file(bucket, path, auth_headers)
+            
+            storage_url = self.build_download_url(bucket, path)
+            headers = {**self._sanitize_headers(auth_headers), "If-Range": etag}
+            
+            part_size = math.ceil(total_size / num_parts)
+            ranges = [(start, min(start + part_size, total_size) - 1)
+                      for start in range(0, total_size, part_size)]
+            
+            responses = await asyncio.gather(*[
+                self._http_client.request(
+                    method="GET",
+                    url=storage_url,
+                    headers={**headers, "Range": f"bytes={start}-{end}"}
+                )
+                for start, end in ranges
+            ])
+            
+            # Assemble parts in place to avoid an intermediate join
+            content = bytearray(total_size)
+            for (start, end), response in zip(ranges, responses):
+                if response.status_code != 206 or len(response.content) != end - start + 1:
+                    # The file changed since the HEAD; fetch it whole instead
+                    return await self.download_file(bucket, path, auth_headers)
+                content[start:end + 1] = response.content
+            
+            return {
+                "status": "success",
+                "content": bytes(content),
+                "content_type": metadata.get("content_type", "application/octet-stream"),
+                "size": total_size,
+                "filename": metadata.get("filename"),
+                "parts": len(ranges)
+            }
+            
+        except httpx.TimeoutException:
+            return {
+                "status": "timeout",
+                "error_message": "Request timeout occurred during download"
+            }
+        except Exception as e:
+            logger.error(f"Parallel download error: {e}")
+            return {
+                "status": "error",
+                "error_code": 500,
+                "error_message": str(e)
+            }
+    
+    async def get_file_metadata(self, bucket: str, path: str, auth_headers: Dict[str, str],
+                                fresh: bool = False) -> Dict[str, Any]:
         """
         Get file metadata using HEAD request.
         
+        Successful results are cached for a short TTL per caller.
+        
         Args:
             bucket: Storage bucket name
             path: File path within bucket
             auth_headers: Authentication headers to forward
+            fresh: Skip the cache and always send the HEAD request
             
         Returns:
             File metadata
@@ -749,6 +864,11 @@ class FileDownloadProxy:
             # Prepare headers
             headers = self._sanitize_headers(auth_headers)
             
+            cache_key = self._metadata_key(bucket, path, headers)
+            cached = None if fresh else self._get_cached_metadata(cache_key)
+            if cached is not None:
+                return dict(cached)
+            
             # Make HEAD request
             response = await self._http_client.request(
                 method="HEAD",
@@ -759,14 +879,17 @@ class FileDownloadProxy:
             # Handle response
             if response.status_code == 200:
                 content_length = response.headers.get("Content-Length", "0")
-                return {
+                metadata = {
                     "status": "found",
                     "content_type": response.headers.get("Content-Type", "application/octet-stream"),
                     "size": int(content_length) if content_length.isdigit() else 0,
                     "last_modified": response.headers.get("Last-Modified"),
                     "etag": response.headers.get("ETag"),
-                    "filename": response.headers.get("X-File-Name")
+                    "filename": response.headers.get("X-File-Name"),
+                    "accept_ranges": response.headers.get("Accept-Ranges")
                 }
+                self._cache_metadata(cache_key, metadata)
+                return dict(metadata)
             else:
                 return {
                     "status": "error",
@@ -803,8 +926,7 @@ class FileDownloadProxy:
             # Prepare headers
             headers = self._sanitize_headers(auth_headers)
             
-            bytes_downloaded = 0
-            content_chunks = []
+            content = bytearray()
             
             async with self._http_client.stream(
                 method="GET",
@@ -814,18 +936,24 @@ class FileDownloadProxy:
                 
                 if response.status_code == 200:
                     total_size = int(response.headers.get("Content-Length", "0"))
+                    last_report = time.monotonic()
                     
+                    # Whole body is buffered anyway, so read in large chunks
                     async for chunk in response.aiter_bytes(chunk_size=self._buffer_size):
-                        content_chunks.append(chunk)
-                        bytes_downloaded += len(chunk)
-                        progress_callback(bytes_downloaded, total_size)
+                        content.extend(chunk)
+                        # Throttle callbacks so they don't dominate small chunks
+                        now = time.monotonic()
+                        if now - last_report >= self._progress_interval:
+                            progress_callback(len(content), total_size)
+                            last_report = now
                     
                     # Final progress update
+                    bytes_downloaded = len(content)
                     progress_callback(bytes_downloaded, bytes_downloaded)
                     
                     return {
                         "status": "success",
-                        "content": b"".join(content_chunks),
+                        "content": bytes(content),
                         "size": bytes_downloaded,
                         "content_type": response.headers.get("Content-Type", "application/octet-stream")
                     }
@@ -844,6 +972,104 @@ class FileDownloadProxy:
                 "error_message": str(e)
             }
     
+    async def download_file_to_path(self, bucket: str, path: str, dest_path: str,
+                                    auth_headers: Dict[str, str],
+                                    progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """
+        Download a file straight to disk without holding it in memory.
+        
+        Each chunk is written in a worker thread while the next one is
+        received, so memory stays bounded by the buffer size. Data goes to
+        a temporary file next to dest_path that replaces it only once the
+        download completes, so a failed or cancelled download leaves any
+        existing file untouched.
+        
+        Args:
+            bucket: Storage bucket name
+            path: File path within bucket
+            dest_path: Local file to create or overwrite
+            auth_headers: Authentication headers
+            progress_callback: Optional progress callback function
+            
+        Returns:
+            Download result with destination path and size
+        """
+        tmp_path = None
+        try:
+            # Build storage URL
+            storage_url = self.build_download_url(bucket, path)
+            
+            # Prepare headers
+            headers = self._sanitize_headers(auth_headers)
+            
+            async with self._http_client.stream(
+                method="GET",
+                url=storage_url,
+                headers=headers
+            ) as response:
+                
+                if response.status_code != 200:
+                    return {
+                        "status": "error",
+                        "error_code": response.status_code,
+                        "error_message": "Download failed"
+                    }
+                
+                total_size = int(response.headers.get("Content-Length", "0"))
+                bytes_written = 0
+                last_report = time.monotonic()
+                
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=os.path.dirname(os.path.abspath(dest_path)),
+                    prefix=f".{os.path.basename(dest_path)}.", suffix=".part"
+                )
+                with os.fdopen(fd, "wb") as f:
+                    pending_write = None
+                    try:
+                        async for chunk in response.aiter_bytes(chunk_size=self._buffer_size):
+                            # Keep at most one write in flight behind the network
+                            if pending_write is not None:
+                                await pending_write
+                            pending_write = asyncio.ensure_future(asyncio.to_thread(f.write, chunk))
+                            bytes_written += len(chunk)
+                            
+                            now = time.monotonic()
+                            if progress_callback and now - last_report >= self._progress_interval:
+                                progress_callback(bytes_written, total_size)
+                                last_report = now
+                    finally:
+                        if pending_write is not None:
+                            await pending_write
+                
+                os.replace(tmp_path, dest_path)
+                tmp_path = None
+                
+                # Final progress update
+                if progress_callback:
+                    progress_callback(bytes_written, bytes_written)
+                
+                return {
+                    "status": "success",
+                    "path": dest_path,
+                    "size": bytes_written,
+                    "content_type": response.headers.get("Content-Type", "application/octet-stream")
+                }
+                
+        except Exception as e:
+            logger.error(f"Download to path error: {e}")
+            return {
+                "status": "error",
+                "error_code": 500,
+                "error_message": str(e)
+            }
+        finally:
+            if tmp_path is not None:
+                # Failed or cancelled: don't leave a partial file behind
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+    
     async def download_file_conditional(self, bucket: str, path: str, auth_headers: Dict[str, str],
                                        if_none_match: str = None) -> Dict[str, Any]:
         """
@@ -864,7 +1090,15 @@ class FileDownloadProxy:
             
             # Prepare headers with conditional request
             headers = self._sanitize_headers(auth_headers)
+            
+            # Answer locally when a fresh HEAD already saw this ETag
             if if_none_match:
+                cached = self._get_cached_metadata(self._metadata_key(bucket, path, headers))
+                if cached is not None and cached.get("etag") == if_none_match:
+                    return {
+                        "status": "not_modified",
+                        "etag": if_none_match
+                    }
                 headers["If-None-Match"] = if_none_match
             
             # Make conditional request
@@ -902,6 +1136,29 @@ class FileDownloadProxy:
                 "error_message": str(e)
             }
     
+    def _metadata_key(self, bucket: str, path: str, headers: Dict[str, str]) -> Tuple:
+        """Cache key for metadata; includes headers so results never cross callers."""
+        return (bucket, path, tuple(sorted(headers.items())))
+    
+    def _get_cached_metadata(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Return fresh cached metadata for key, dropping it if expired."""
+        entry = self._meta_cache.get(key)
+        if entry is None:
+            return None
+        metadata, expiry = entry
+        if time.monotonic() >= expiry:
+            del self._meta_cache[key]
+            return None
+        self._meta_cache.move_to_end(key)
+        return metadata
+    
+    def _cache_metadata(self, key: Tuple, metadata: Dict[str, Any]) -> None:
+        """Store metadata for key, evicting the least recently used entry when full."""
+        self._meta_cache[key] = (metadata, time.monotonic() + self._meta_cache_ttl)
+        self._meta_cache.move_to_end(key)
+        if len(self._meta_cache) > self._meta_cache_size:
+            self._meta_cache.popitem(last=False)
+    
     def build_download_url(self, bucket: str, path: str) -> str:
         """Build download URL for storage service with proper URL encoding."""
         encoded = self._encode_path(bucket, path)
@@ -917,46 +1174,12 @@ class FileDownloadProxy:
         Returns:
             True if path is safe to use
         """
-        # Check for path traversal attempts
-        if ".." in path or path.startswith("/"):
-            return False
-        
-        # Check for null bytes
-        if "\x00" in path:
-            return False
-        
-        # Check for unencoded spaces (should be %20)
-        if " " in path:
-            return False
-        
-        # Check for Windows reserved names
-        reserved_names = {
-            "CON", "PRN", "AUX", "NUL",
-            "COM1", "COM2", "COM3", "COM4", "COM5", "COM6", "COM7", "COM8", "COM9",
-            "LPT1", "LPT2", "LPT3", "LPT4", "LPT5", "LPT6", "LPT7", "LPT8", "LPT9"
-        }
-        
-        path_parts = path.split("/")
-        for part in path_parts:
-            # Check filename without extension for reserved names
-            filename_base = part.split(".")[0] if "." in part else part
-            if filename_base.upper() in reserved_names:
-                return False
-        
-        return True
+        return _INVALID_PATH_RE.search(path) is None
     
     def _sanitize_headers(self, headers: Dict[str, str]) -> Dict[str, str]:
-        """Sanitize headers for forwarding."""
-        hop_by_hop = {
-            "connection", "keep-alive", "proxy-authenticate",
-            "proxy-authorization", "te", "trailers", "transfer-encoding",
-            "upgrade", "host"
-        }
-        
-        return {
-            key: value for key, value in headers.items()
-            if key.lower() not in hop_by_hop
-        }
+        """Keep only the allow-listed headers for forwarding."""
+        forward = self._forward_headers
+        return {key: value for key, value in headers.items() if key.lower() in forward}
     
     def get_configuration(self) -> Dict[str, Any]:
         """Get file download proxy configuration."""
@@ -964,12 +1187,22 @@ class FileDownloadProxy:
             "download_timeout": self._download_timeout,
             "max_concurrent_downloads": self._max_concurrent_downloads,
             "buffer_size": self._buffer_size,
+            "max_connections": self._max_connections,
+            "max_keepalive_connections": self._max_keepalive_connections,
+            "keepalive_expiry": self._keepalive_expiry,
+            "streaming_mode": "as_available",
+            "metadata_cache_ttl": self._meta_cache_ttl,
+            "metadata_cache_size": self._meta_cache_size,
             "supports_range_requests": True,
             "supports_conditional_requests": True
         }
     
-    async def cleanup(self):
-        """Clean up resources."""
+    async def aclose(self):
+        """Close the pooled HTTP client and its keep-alive connections."""
         if self._http_client and not self._http_client.is_closed:
             await self._http_client.aclose()
+    
+    async def cleanup(self):
+        """Clean up resources."""
+        await self.aclose()
         logger.info("FileDownloadProxy cleanup completed")
\ No newline at end of file
@@ -52,13 +52,13 @@ async def lifespan(app: FastAPI):
     
     # Startup
     try:
-        from shared.database.connection_manager import DatabaseConnectionManager
+        from shared.database.connection_manager import get_shared_connection_manager
         from shared.config.config_manager import ConfigManager
         from shared.database.pg_notify_listener import PgNotifyListener
 
         # Initialize database connection and schema
         config = ConfigManager()
-        db_manager = DatabaseConnectionManager(config)
+        db_manager = get_shared_connection_manager(config)
         await db_manager.initialize_schema()
 
         logger.info("Database schema initialized successfully")
@@ -105,6 +105,12 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Error stopping PG NOTIFY listener: {e}")
 
+    try:
+        from shared.database.connection_manager import close_shared_connection_manager
+        await close_shared_connection_manager()
+    except Exception as e:
+        logger.error(f"Error closing database connection pool: {e}")
+
 # Create FastAPI app with lifespan handler
 # Configure OpenAPI tags to control documentation order
 openapi_tags = [
@@ -40,7 +40,7 @@ export PYTHONPATH=".:$PYTHONPATH"
 # Run tests with different options based on arguments
 if [ "$1" = "unit" ]; then
     echo -e "${GREEN}🏃 Running unit tests only...${NC}"
-    uv run pytest tests/ -m "unit" "${@:2}"
+    uv run pytest tests/ -m "unit" -n auto --dist=loadgroup "${@:2}"
 elif [ "$1" = "integration" ]; then
     echo -e "${GREEN}🏃 Running integration tests only...${NC}"
     uv run pytest tests/ -m "integration" "${@:2}"
@@ -53,7 +53,7 @@ elif [ "$1" = "watch" ]; then
     # Note: For true watch mode, you'd need pytest-watch: pip install pytest-watch
 else
     echo -e "${GREEN}🏃 Running all tests...${NC}"
-    uv run pytest tests/ "$@"
+    uv run pytest tests/ -n auto --dist=loadgroup "$@"
 fi
 
 echo -e "${GREEN}✅ Test execution completed${NC}"
\ No newline at end of file
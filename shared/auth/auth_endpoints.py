@@ -11,6 +11,7 @@ from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any, Protocol
 from .jwt_service import JWTService
 from .user_store import UserStoreInterface
+from shared.config.config_manager import get_bcrypt_rounds
 from shared.models.user import User
 
 
@@ -24,13 +25,17 @@ UserStore = UserStoreInterface
 class AuthEndpoints:
     """Authentication endpoints for user management."""
     
+    # Compiled once and shared by all instances
+    _email_re = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+    
     def __init__(
         self,
         api_key: str,
         jwt_service: JWTService,
         user_store: UserStore,
         enable_rate_limiting: bool = False,
-        max_attempts_per_minute: int = 10
+        max_attempts_per_minute: int = 10,
+        bcrypt_rounds: Optional[int] = None
     ):
         """
         Initialize authentication endpoints.
@@ -41,17 +46,21 @@ class AuthEndpoints:
             user_store: User storage implementation
             enable_rate_limiting: Enable rate limiting protection
             max_attempts_per_minute: Max attempts per minute per IP
+            bcrypt_rounds: bcrypt cost factor (defaults to BCRYPT_ROUNDS env or 12)
         """
         if not jwt_service:
             raise ValueError("JWT service must be provided")
         if not user_store:
             raise ValueError("User store must be provided")
+        if bcrypt_rounds is not None and not 4 <= bcrypt_rounds <= 31:
+            raise ValueError("bcrypt_rounds must be between 4 and 31")
         
         self.api_key = api_key
         self.jwt_service = jwt_service
         self.user_store = user_store
         self.enable_rate_limiting = enable_rate_limiting
         self.max_attempts_per_minute = max_attempts_per_minute
+        self.bcrypt_rounds = bcrypt_rounds or get_bcrypt_rounds()
         
         # Simple in-memory rate limiting (in production use Redis)
         self._rate_limit_store: Dict[str, Dict[str, Any]] = {}
@@ -69,8 +78,7 @@ class AuthEndpoints:
     
     def _validate_email(self, email: str) -> bool:
         """Validate email format."""
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(email_pattern, email) is not None
+        return self._email_re.match(email) is not None
     
     def _check_rate_limit(self, key: str) -> bool:
         """Check if rate limit is exceeded for key."""
@@ -102,7 +110,7 @@ class AuthEndpoints:
     
     def _hash_password(self, password: str) -> str:
         """Hash password using bcrypt."""
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=self.bcrypt_rounds)
         return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
     
     def _verify_password(self, password: str, hashed: str) -> bool:
@@ -1,5 +1,5 @@
 """Configuration management package for SelfDB."""
 
-from .config_manager import ConfigManager, ConfigValidationError
+from .config_manager import ConfigManager, ConfigValidationError, get_bcrypt_rounds
 
-__all__ = ['ConfigManager', 'ConfigValidationError']
\ No newline at end of file
+__all__ = ['ConfigManager', 'ConfigValidationError', 'get_bcrypt_rounds']
\ No newline at end of file
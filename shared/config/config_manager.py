@@ -16,6 +16,26 @@ class ConfigValidationError(Exception):
     pass
 
 
+def get_bcrypt_rounds() -> int:
+    """
+    Get the bcrypt cost factor from BCRYPT_ROUNDS (default 12).
+
+    Returns:
+        Cost factor accepted by bcrypt.gensalt()
+
+    Raises:
+        ConfigValidationError: If the value is not an integer from 4 to 31
+    """
+    value = os.getenv('BCRYPT_ROUNDS', '12')
+    try:
+        rounds = int(value)
+    except ValueError:
+        raise ConfigValidationError(f"BCRYPT_ROUNDS must be an integer, got {value!r}") from None
+    if not 4 <= rounds <= 31:
+        raise ConfigValidationError(f"BCRYPT_ROUNDS must be between 4 and 31, got {rounds}")
+    return rounds
+
+
 class ConfigManager:
     """
     Central configuration management for SelfDB.
@@ -203,6 +223,10 @@ class ConfigManager:
             raise ValueError(f"Unknown service: {service}")
         return self._ports[service]
     
+    def get_all_ports(self) -> Dict[str, int]:
+        """Get a copy of the configured ports for every service, keyed by service name."""
+        return dict(self._ports)
+    
     def get_service_name(self, service: str) -> str:
         """Get the service name with project prefix if configured."""
         project_name = os.getenv('COMPOSE_PROJECT_NAME', 'selfdb')
@@ -10,17 +10,198 @@ import asyncpg
 import bcrypt
 import logging
 import os
+import random
+import re
 import time
 import uuid
 from contextlib import asynccontextmanager
-from typing import Optional, Dict, Any, AsyncGenerator, Callable, List
+from contextvars import ContextVar
+from functools import cached_property
+from typing import Optional, Dict, Any, AsyncGenerator, Awaitable, Callable, List, Tuple
+from urllib.parse import quote
 from datetime import datetime, timedelta, timezone
 
-from shared.config.config_manager import ConfigManager
+from shared.config.config_manager import ConfigManager, get_bcrypt_rounds
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Connection held by the transaction open in the current task, so nested
+# transaction() and acquire() calls reuse it instead of taking another one
+# from the pool (nested transactions then become savepoints).
+_transaction_connection: ContextVar[Optional[Tuple["DatabaseConnectionManager", asyncpg.Connection]]] = (
+    ContextVar("_transaction_connection", default=None)
+)
+
+# Credentials made only of these characters need no URL quoting
+_SAFE_RE = re.compile(r"[A-Za-z0-9_\-.]+")
+
+
+def _quote_credential(value: Optional[str]) -> str:
+    """Percent-encode value for a DSN, skipping quote() for the common safe case."""
+    if value is None:
+        return ""
+    return value if _SAFE_RE.fullmatch(value) else quote(value, safe="")
+
+
+# All schema DDL, sent to the server as one multi-statement execute (simple
+# query protocol) so initialization costs a single round trip.
+DDL_BUNDLE = """
+CREATE TABLE IF NOT EXISTS migrations (
+    id SERIAL PRIMARY KEY,
+    version INTEGER NOT NULL UNIQUE,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS users (
+    id VARCHAR(36) PRIMARY KEY,
+    email VARCHAR(255) UNIQUE NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    first_name VARCHAR(100),
+    last_name VARCHAR(100),
+    role VARCHAR(20) NOT NULL DEFAULT 'USER',
+    is_active BOOLEAN NOT NULL DEFAULT TRUE,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    last_login_at TIMESTAMPTZ
+);
+
+CREATE TABLE IF NOT EXISTS data_records (
+    id SERIAL PRIMARY KEY,
+    user_id VARCHAR(36) REFERENCES users(id) ON DELETE CASCADE,
+    data JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- SYSTEM RESTART PERSISTENCE TABLES (Phase 7.6.4)
+
+CREATE TABLE IF NOT EXISTS system_states (
+    id VARCHAR(255) PRIMARY KEY,
+    state_data JSONB NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS active_executions (
+    id SERIAL PRIMARY KEY,
+    execution_id VARCHAR(255) NOT NULL,
+    function_id VARCHAR(255) NOT NULL,
+    user_id VARCHAR(255),
+    execution_data JSONB NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS resource_pool_states (
+    pool_id VARCHAR(255) PRIMARY KEY,
+    resource_data JSONB NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS audit_logs (
+    id SERIAL PRIMARY KEY,
+    request_id VARCHAR(255) NOT NULL,
+    user_id VARCHAR(255),
+    function_id VARCHAR(255),
+    event_type VARCHAR(100) NOT NULL,
+    event_data JSONB NOT NULL,
+    success BOOLEAN DEFAULT true,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS performance_metrics (
+    id SERIAL PRIMARY KEY,
+    function_id VARCHAR(255) NOT NULL,
+    execution_time_ms INTEGER NOT NULL,
+    memory_used_mb FLOAT NOT NULL,
+    success BOOLEAN NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS system_checkpoints (
+    id VARCHAR(255) PRIMARY KEY,
+    checkpoint_data JSONB NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create indexes for performance
+CREATE INDEX IF NOT EXISTS idx_system_states_created_at ON system_states(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_active_executions_function_id ON active_executions(function_id);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_created_at ON audit_logs(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_request_id ON audit_logs(request_id);
+CREATE INDEX IF NOT EXISTS idx_performance_metrics_function_id ON performance_metrics(function_id);
+CREATE INDEX IF NOT EXISTS idx_performance_metrics_created_at ON performance_metrics(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_system_checkpoints_created_at ON system_checkpoints(created_at DESC);
+
+-- REALTIME NOTIFY TRIGGERS (Added for Phoenix integration)
+
+-- Generic notify function for all tables
+CREATE OR REPLACE FUNCTION notify_table_change()
+RETURNS TRIGGER AS $$
+DECLARE
+  payload JSON;
+BEGIN
+  IF (TG_OP = 'DELETE') THEN
+    payload = json_build_object(
+      'action', TG_OP,
+      'table', TG_TABLE_NAME,
+      'old_data', row_to_json(OLD),
+      'timestamp', NOW()
+    );
+  ELSE
+    payload = json_build_object(
+      'action', TG_OP,
+      'table', TG_TABLE_NAME,
+      'new_data', row_to_json(NEW),
+      'old_data', CASE WHEN TG_OP = 'UPDATE' THEN row_to_json(OLD) ELSE NULL END,
+      'timestamp', NOW()
+    );
+  END IF;
+
+  PERFORM pg_notify(TG_TABLE_NAME || '_events', payload::text);
+  
+  RETURN CASE WHEN TG_OP = 'DELETE' THEN OLD ELSE NEW END;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Drop existing triggers if they exist (idempotent)
+DROP TRIGGER IF EXISTS users_notify ON users;
+DROP TRIGGER IF EXISTS files_notify ON files;
+DROP TRIGGER IF EXISTS buckets_notify ON buckets;
+DROP TRIGGER IF EXISTS functions_notify ON functions;
+DROP TRIGGER IF EXISTS tables_notify ON tables;
+DROP TRIGGER IF EXISTS webhooks_notify ON webhooks;
+DROP TRIGGER IF EXISTS webhook_deliveries_notify ON webhook_deliveries;
+
+-- Create triggers
+CREATE TRIGGER users_notify 
+  AFTER INSERT OR UPDATE OR DELETE ON users
+  FOR EACH ROW EXECUTE FUNCTION notify_table_change();
+
+CREATE TRIGGER files_notify 
+  AFTER INSERT OR UPDATE OR DELETE ON files
+  FOR EACH ROW EXECUTE FUNCTION notify_table_change();
+
+CREATE TRIGGER buckets_notify 
+  AFTER INSERT OR UPDATE OR DELETE ON buckets
+  FOR EACH ROW EXECUTE FUNCTION notify_table_change();
+
+CREATE TRIGGER functions_notify 
+  AFTER INSERT OR UPDATE OR DELETE ON functions
+  FOR EACH ROW EXECUTE FUNCTION notify_table_change();
+
+CREATE TRIGGER tables_notify 
+  AFTER INSERT OR UPDATE OR DELETE ON tables
+  FOR EACH ROW EXECUTE FUNCTION notify_table_change();
+
+CREATE TRIGGER webhooks_notify 
+  AFTER INSERT OR UPDATE OR DELETE ON webhooks
+  FOR EACH ROW EXECUTE FUNCTION notify_table_change();
+
+CREATE TRIGGER webhook_deliveries_notify 
+  AFTER INSERT OR UPDATE OR DELETE ON webhook_deliveries
+  FOR EACH ROW EXECUTE FUNCTION notify_table_change();
+"""
+
 
 class DatabaseConnectionError(Exception):
     """Raised when database connection operations fail."""
@@ -32,13 +213,30 @@ class HealthCheckError(Exception):
     pass
 
 
+class _PoolConnection(asyncpg.Connection):
+    """Pooled connection that remembers whether it was closed from our side."""
+    __slots__ = ('_closed_locally',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._closed_locally = False
+
+    async def close(self, *, timeout=None):
+        self._closed_locally = True
+        await super().close(timeout=timeout)
+
+    def terminate(self):
+        self._closed_locally = True
+        super().terminate()
+
+
 class DatabaseConnectionManager:
     """
     Manages PostgreSQL database connections with async support via PgBouncer.
 
     Features:
     - Async database connections using asyncpg through PgBouncer
-    - Single connections (PgBouncer handles all pooling)
+    - asyncpg connection pool, created lazily on first use
     - Health check functionality
     - Automatic reconnection with exponential backoff
     - Transaction management with isolation levels
@@ -57,21 +255,48 @@ class DatabaseConnectionManager:
         """
         self.config = config_manager
 
-        # All connections go through PgBouncer which handles pooling
-        logger.info("Using PgBouncer for all database connections (pooling handled by PgBouncer)")
+        # Connection pool through PgBouncer, created lazily by connect()
+        self._pool: Optional[asyncpg.Pool] = None
+
+        # In Docker every connection goes through PgBouncer, which already
+        # multiplexes server connections; keep the local pool small there so
+        # the two pools don't stack, and use a larger one against bare Postgres.
+        self.behind_pgbouncer: bool = bool(self.config.is_docker_environment)
+
+        # Pool settings
+        self.pool_min_size: int = 1 if self.behind_pgbouncer else 10
+        self.pool_max_size: int = 5 if self.behind_pgbouncer else 50
+        self.pool_max_queries: int = 50000
+        self.pool_max_inactive_connection_lifetime: float = 300.0
+        self.command_timeout: float = 60.0
 
-        # Connection state - single connection through PgBouncer
-        self._connection: Optional[asyncpg.Connection] = None
+        # Prepared statements asyncpg keeps per connection (bare Postgres only)
+        self.statement_cache_size: int = 1024
 
         # Reconnection settings
         self.enable_auto_reconnect: bool = True
         self.max_reconnect_attempts: int = 5
         self.reconnect_backoff_base: float = 1.0
         self.reconnect_backoff_max: float = 60.0
+        # Coroutine used to wait between reconnect attempts (swappable in tests)
+        self._sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+        # Delays actually waited by the most recent connect_with_retry call
+        self._last_backoffs: List[float] = []
+        # Set while the database is believed reachable; cleared when a pooled
+        # connection is terminated until the background reconnect succeeds.
+        self._connected = asyncio.Event()
+        self._reconnect_task: Optional[asyncio.Task] = None
+        # Serializes pool creation so concurrent first callers share one pool
+        self._pool_lock = asyncio.Lock()
 
         # Health monitoring
         self._health_monitoring_task: Optional[asyncio.Task] = None
         self._last_health_check: Optional[datetime] = None
+        # A passing check is reused for _health_ttl seconds so frequent polling
+        # doesn't keep a scale-to-zero Postgres awake; reset on connection errors.
+        self._health_cache_ts: float = 0.0
+        self._health_cache_ok: bool = False
+        self._health_ttl: float = 5.0
 
         # Transaction stack for nested transactions
         self._transaction_stack: List[asyncpg.Transaction] = []
@@ -81,16 +306,45 @@ class DatabaseConnectionManager:
         # Always use PgBouncer connection
         host = self.config.pgbouncer_host
         port = self.config.pgbouncer_port
-        db = self.config.postgres_db
-        user = self.config.postgres_user
-        password = self.config.postgres_password
+        db = _quote_credential(self.config.postgres_db)
+        user = _quote_credential(self.config.postgres_user)
+        password = _quote_credential(self.config.postgres_password)
         logger.debug(f"Using PgBouncer connection: {host}:{port}")
-        connection_string = f"postgresql://{user}:{password}@{host}:{port}/{db}"
-        logger.debug(f"Generated connection string: {connection_string}")
-        return connection_string
+        return f"postgresql://{user}:{password}@{host}:{port}/{db}"
 
-    def get_connection_string(self) -> str:
-        """Get the PostgreSQL connection string via PgBouncer."""
+    def _connect_target(self) -> Dict[str, Any]:
+        """Where asyncpg should connect, as create_pool keyword arguments."""
+        database_url = os.getenv('DATABASE_URL')
+        if database_url:
+            return {'dsn': database_url}
+
+        # Pass credentials separately so the password never sits in a URL
+        # that could end up in logs or tracebacks.
+        return {
+            'host': self.config.pgbouncer_host,
+            'port': self.config.pgbouncer_port,
+            'user': self.config.postgres_user,
+            'password': self.config.postgres_password,
+            'database': self.config.postgres_db,
+        }
+
+    def _pool_connect_kwargs(self) -> Dict[str, Any]:
+        """Extra asyncpg connection arguments for the pool."""
+        if not self.behind_pgbouncer:
+            # asyncpg prepares each query once per connection and reuses the
+            # plan from this LRU cache on later calls with the same SQL text.
+            return {'statement_cache_size': self.statement_cache_size}
+        # PgBouncer in transaction mode can hand each statement to a different
+        # server connection, so asyncpg's per-connection prepared statements
+        # can't be cached.
+        return {
+            'statement_cache_size': 0,
+            'server_settings': {'application_name': 'selfdb'},
+        }
+
+    @cached_property
+    def _connection_string(self) -> str:
+        """Connection string rendered once from the environment and config."""
         # First try to use DATABASE_URL if available (should point to PgBouncer)
         database_url = os.getenv('DATABASE_URL')
         if database_url:
@@ -99,49 +353,145 @@ class DatabaseConnectionManager:
 
         # Otherwise construct PgBouncer connection string
         return self._get_connection_string()
+
+    def get_connection_string(self) -> str:
+        """Get the PostgreSQL connection string via PgBouncer."""
+        return self._connection_string
+
+    def invalidate_connection_string(self) -> None:
+        """Drop the cached connection string so the next call re-reads config."""
+        self.__dict__.pop('_connection_string', None)
     
-    async def connect(self, timeout: Optional[int] = None) -> asyncpg.Connection:
+    async def connect(self, timeout: Optional[int] = None) -> asyncpg.Pool:
         """
-        Establish a single database connection.
+        Create the database connection pool.
         
         Args:
             timeout: Connection timeout in seconds
             
         Returns:
-            Database connection
+            Database connection pool
             
         Raises:
-            DatabaseConnectionError: If connection fails
+            asyncpg.PostgresError: If the server rejects the connection
+            OSError: If the host cannot be reached
+            asyncio.TimeoutError: If connecting takes longer than timeout
         """
-        connection_string = self.get_connection_string()
-        
-        try:
-            self._connection = await asyncpg.connect(
-                connection_string,
-                timeout=timeout or 60
+        if self._pool is not None and not self._pool.is_closing():
+            return self._pool
+
+        async with self._pool_lock:
+            # Another caller may have created the pool while we waited
+            if self._pool is not None and not self._pool.is_closing():
+                return self._pool
+
+            # Driver errors propagate unchanged; connect_with_retry is the
+            # boundary that turns them into DatabaseConnectionError.
+            self._pool = await asyncpg.create_pool(
+                **self._connect_target(),
+                min_size=self.pool_min_size,
+                max_size=self.pool_max_size,
+                max_queries=self.pool_max_queries,
+                max_inactive_connection_lifetime=self.pool_max_inactive_connection_lifetime,
+                command_timeout=self.command_timeout,
+                timeout=timeout or 60,
+                init=self._init_connection,
+                connection_class=_PoolConnection,
+                **self._pool_connect_kwargs()
             )
-            logger.info("Database connection established")
-            return self._connection
-            
-        except asyncpg.PostgresConnectionError as e:
-            raise DatabaseConnectionError(f"PostgreSQL connection error: {e}")
-        except asyncpg.InvalidPasswordError as e:
-            raise DatabaseConnectionError(f"Invalid password: {e}")
-        except asyncpg.InvalidCatalogNameError as e:
-            raise DatabaseConnectionError(f"Database does not exist: {e}")
-        except asyncio.TimeoutError as e:
-            raise DatabaseConnectionError(f"Connection timeout: {e}")
-        except OSError as e:
-            raise DatabaseConnectionError(f"Cannot connect to host: {e}")
-        except Exception as e:
-            raise DatabaseConnectionError(f"Unexpected connection error: {e}")
+            self._connected.set()
+        logger.info(
+            f"Database connection pool established (min={self.pool_min_size}, max={self.pool_max_size})"
+        )
+        return self._pool
+
+    async def _init_connection(self, conn: asyncpg.Connection) -> None:
+        """Pool init hook: get told when the server side of conn goes away."""
+        conn.add_termination_listener(self._on_terminated)
+
+    def _on_terminated(self, conn: asyncpg.Connection) -> None:
+        """
+        Termination listener for pooled connections.
+
+        Marks the database as unreachable and starts a background reconnect,
+        so the outage is noticed when the socket closes rather than on the
+        next query. asyncpg also calls this when the pool itself recycles a
+        connection (max_queries, idle lifetime); those closes are ignored.
+        """
+        if getattr(conn, '_closed_locally', False):
+            return  # recycled by the pool
+        if self._pool is None or self._pool.is_closing():
+            return  # closed by us
+
+        self._connected.clear()
+        self._health_cache_ts = 0.0
+        if self.enable_auto_reconnect and (self._reconnect_task is None or self._reconnect_task.done()):
+            self._start_reconnect()
+
+    def _start_reconnect(self) -> None:
+        """Run _reconnect_with_backoff in the background."""
+        self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect_with_backoff())
+        self._reconnect_task.add_done_callback(self._on_reconnect_done)
+
+    @staticmethod
+    def _on_reconnect_done(task: asyncio.Task) -> None:
+        """Retrieve a failed reconnect's exception so it is logged, not left floating."""
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background reconnect failed: {task.exception()}")
+
+    async def _reconnect_with_backoff(self) -> None:
+        """
+        Probe the database with backoff until it answers again.
+
+        Raises:
+            DatabaseConnectionError: If max reconnect attempts are exceeded
+        """
+        last_exception = None
+        self._last_backoffs = []
+        for attempt in range(self.max_reconnect_attempts):
+            try:
+                async with self.acquire() as conn:
+                    await conn.fetchval('SELECT 1')
+            except Exception as e:
+                last_exception = e
+                if attempt < self.max_reconnect_attempts - 1:
+                    delay = self._backoff_delay(attempt)
+                    logger.warning(
+                        f"Reconnect probe {attempt + 1} failed, retrying in {delay:.2f}s: {e}"
+                    )
+                    await self._sleep(delay)
+            else:
+                self._connected.set()
+                logger.info("Database connection restored")
+                return
+        raise DatabaseConnectionError(
+            f"Max reconnection attempts ({self.max_reconnect_attempts}) exceeded. "
+            f"Last error: {last_exception}"
+        ) from last_exception
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Jittered, capped exponential delay before retry number attempt + 1."""
+        delay = min(
+            self.reconnect_backoff_max,
+            self.reconnect_backoff_base * (2 ** attempt)
+        )
+        delay = random.uniform(delay / 2, delay)
+        self._last_backoffs.append(delay)
+        return delay
     
+    async def _ensure_pool(self, timeout: Optional[float] = None) -> asyncpg.Pool:
+        """Return the connection pool, creating it if it doesn't exist or is closing."""
+        if self._pool is None or self._pool.is_closing():
+            await self.connect(timeout=timeout)
+        return self._pool
+
     @asynccontextmanager
     async def acquire(self, timeout: Optional[float] = None) -> AsyncGenerator[asyncpg.Connection, None]:
         """
-        Acquire a database connection through PgBouncer.
+        Acquire a database connection from the pool.
 
-        PgBouncer handles all connection pooling, so we use single connections.
+        Inside a transaction() block the transaction's own connection is
+        yielded, so queries in the same task see the transaction's state.
 
         Args:
             timeout: Connection timeout in seconds
@@ -150,47 +500,61 @@ class DatabaseConnectionManager:
             Database connection
 
         Raises:
-            DatabaseConnectionError: If connection acquisition fails
+            asyncpg.PostgresError, OSError or asyncio.TimeoutError from the
+            driver if the pool cannot be created or a connection acquired
         """
-        # Ensure we have an active connection
-        if not self._connection or self._connection.is_closed:
-            await self.connect(timeout=timeout)
+        held = _transaction_connection.get()
+        if held is not None and held[0] is self:
+            yield held[1]
+            return
 
         try:
-            yield self._connection
-        finally:
-            # Keep connection open for reuse with PgBouncer
-            pass
+            pool = await self._ensure_pool(timeout=timeout)
+            async with pool.acquire(timeout=timeout) as conn:
+                yield conn
+        except asyncpg.PostgresConnectionError:
+            self._health_cache_ts = 0.0
+            raise
 
     async def close(self):
         """Close database connections and cleanup resources."""
-        # Stop health monitoring
-        if self._health_monitoring_task:
-            self._health_monitoring_task.cancel()
-            try:
-                await self._health_monitoring_task
-            except asyncio.CancelledError:
-                pass
-
-        # Close single connection
-        if self._connection:
-            await self._connection.close()
-            self._connection = None
-            logger.info("Database connection closed")
+        # Stop health monitoring and any background reconnect
+        for task in (self._health_monitoring_task, self._reconnect_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._reconnect_task = None
+        self._connected.clear()
+
+        # Close the connection pool
+        if self._pool:
+            await self._pool.close()
+            self._pool = None
+            logger.info("Database connection pool closed")
     
     async def health_check(self) -> bool:
         """
         Perform database health check.
 
+        A passing result is cached for _health_ttl seconds.
+
         Returns:
             True if database is healthy, False otherwise
         """
+        if self._health_cache_ok and time.monotonic() - self._health_cache_ts < self._health_ttl:
+            return True
+
         try:
             async with self.acquire() as conn:
                 result = await conn.fetchval('SELECT 1')
                 is_healthy = result == 1
 
             self._last_health_check = datetime.now(timezone.utc)
+            self._health_cache_ok = is_healthy
+            self._health_cache_ts = time.monotonic()
             if is_healthy:
                 logger.debug("Database health check passed")
             else:
@@ -205,7 +569,8 @@ class DatabaseConnectionManager:
     async def start_health_monitoring(
         self,
         interval: float = 30.0,
-        callback: Optional[Callable[[bool], None]] = None
+        callback: Optional[Callable[[bool], None]] = None,
+        sleeper: Callable[[float], Awaitable[None]] = asyncio.sleep
     ):
         """
         Start periodic health monitoring.
@@ -213,6 +578,7 @@ class DatabaseConnectionManager:
         Args:
             interval: Check interval in seconds
             callback: Optional callback function for health status changes
+            sleeper: Coroutine awaited between checks
         """
         async def monitor():
             while True:
@@ -220,66 +586,89 @@ class DatabaseConnectionManager:
                     is_healthy = await self.health_check()
                     if callback:
                         await callback(is_healthy)
-                    await asyncio.sleep(interval)
+                    await sleeper(interval)
                 except asyncio.CancelledError:
                     logger.info("Health monitoring stopped")
                     break
                 except Exception as e:
                     logger.error(f"Health monitoring error: {e}")
-                    await asyncio.sleep(interval)
+                    await sleeper(interval)
         
         self._health_monitoring_task = asyncio.create_task(monitor())
     
-    async def ensure_connected(self):
-        """Ensure database connection is active, reconnect if necessary."""
-        if not self._connection or self._connection.is_closed:
+    async def ensure_connected(self, timeout: float = 60.0) -> None:
+        """
+        Ensure the database is reachable, reconnecting if necessary.
+
+        Waits for _connected to be set again after a terminated connection.
+        If no reconnect is in flight (auto-reconnect is disabled, or the
+        last one gave up) a new one is started here.
+
+        Args:
+            timeout: Seconds to wait for the reconnect to succeed
+
+        Raises:
+            DatabaseConnectionError: If the reconnect runs out of attempts
+                or does not succeed within timeout
+        """
+        if self._pool is None or self._pool.is_closing():
             logger.info("Connection lost, attempting to reconnect")
             await self.connect_with_retry()
+            return
+        if self._connected.is_set():
+            return
+
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._start_reconnect()
+        reconnect = self._reconnect_task
+
+        waiter = asyncio.ensure_future(self._connected.wait())
+        try:
+            await asyncio.wait({waiter, reconnect}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            waiter.cancel()
+
+        if self._connected.is_set():
+            return
+        if reconnect.done() and not reconnect.cancelled() and reconnect.exception() is not None:
+            raise reconnect.exception()
+        raise DatabaseConnectionError(f"Database not reachable after {timeout}s")
     
-    async def connect_with_retry(self) -> asyncpg.Connection:
+    async def connect_with_retry(self) -> asyncpg.Pool:
         """
         Connect to database with automatic retry and exponential backoff.
+
+        Each delay is drawn uniformly from the upper half of the capped
+        exponential step, so clients that lose the database together do
+        not reconnect in lockstep.
         
         Returns:
-            Database connection
+            Database connection pool
             
         Raises:
             DatabaseConnectionError: If max retries exceeded
         """
         last_exception = None
+        self._last_backoffs = []
         
         for attempt in range(self.max_reconnect_attempts):
             try:
                 return await self.connect()
-            except DatabaseConnectionError as e:
+            except Exception as e:
                 last_exception = e
                 if attempt < self.max_reconnect_attempts - 1:
-                    # Calculate exponential backoff
-                    delay = min(
-                        self.reconnect_backoff_base * (2 ** attempt),
-                        self.reconnect_backoff_max
-                    )
+                    delay = self._backoff_delay(attempt)
                     logger.warning(
-                        f"Connection attempt {attempt + 1} failed, retrying in {delay}s: {e}"
+                        f"Connection attempt {attempt + 1} failed, retrying in {delay:.2f}s: {e}"
                     )
-                    await asyncio.sleep(delay)
+                    await self._sleep(delay)
                 else:
                     logger.error(f"Max reconnection attempts ({self.max_reconnect_attempts}) exceeded")
         
         raise DatabaseConnectionError(
             f"Max reconnection attempts ({self.max_reconnect_attempts}) exceeded. "
             f"Last error: {last_exception}"
-        )
-
-    async def initialize_schema(self):
-        """
-        Initialize database schema.
-
-        This is a placeholder - schema initialization should be handled
-        by database migrations, not by the connection manager.
-        """
-        logger.info("Schema initialization should be handled by migrations")
-        # This could potentially run migrations, but for now it's a no-op
+        ) from last_exception
 
     @asynccontextmanager
     async def transaction(
@@ -311,17 +700,21 @@ class DatabaseConnectionManager:
             if hasattr(tx_obj, '__aenter__') and hasattr(tx_obj, '__aexit__'):
                 async with tx_obj as tx:
                     self._transaction_stack.append(tx)
+                    token = _transaction_connection.set((self, conn))
                     try:
                         yield conn
                     finally:
+                        _transaction_connection.reset(token)
                         self._transaction_stack.pop()
             else:
                 # Handle case where transaction() returns a coroutine
                 tx = await tx_obj if asyncio.iscoroutine(tx_obj) else tx_obj
                 self._transaction_stack.append(tx)
+                token = _transaction_connection.set((self, conn))
                 try:
                     yield conn
                 finally:
+                    _transaction_connection.reset(token)
                     self._transaction_stack.pop()
     
     async def execute(
@@ -336,22 +729,70 @@ class DatabaseConnectionManager:
         Args:
             query: SQL query to execute
             *args: Query parameters
-            timeout: Query timeout in seconds
+            timeout: Seconds to wait for a pooled connection and, separately,
+                for the query (enforced by asyncpg; defaults to command_timeout)
 
         Returns:
             Command status
 
         Raises:
-            DatabaseConnectionError: If execution fails
+            asyncio.TimeoutError: If no connection frees up or the query runs
+                longer than timeout
+            asyncpg.PostgresError: If the server rejects the query
         """
-        try:
-            async with self.acquire() as conn:
-                return await conn.execute(query, *args, timeout=timeout)
-        except asyncio.TimeoutError:
-            raise DatabaseConnectionError("Query timeout exceeded")
-        except Exception as e:
-            raise DatabaseConnectionError(f"Query execution failed: {e}")
+        async with self.acquire(timeout=timeout) as conn:
+            return await conn.execute(query, *args, timeout=timeout)
+    
+    async def executemany(
+        self,
+        query: str,
+        args: List[tuple],
+        timeout: Optional[float] = None
+    ) -> None:
+        """
+        Execute a SQL command once per argument tuple in a single round trip.
+
+        Args:
+            query: SQL query to execute
+            args: Sequence of parameter tuples
+            timeout: Seconds to wait for a pooled connection and, separately,
+                for the batch (enforced by asyncpg; defaults to command_timeout)
+
+        Raises:
+            asyncio.TimeoutError: If no connection frees up or the batch runs
+                longer than timeout
+            asyncpg.PostgresError: If the server rejects the query
+        """
+        async with self.acquire(timeout=timeout) as conn:
+            await conn.executemany(query, args, timeout=timeout)
     
+    async def _probe_state(self) -> Tuple[int, Optional[int]]:
+        """
+        Read the public table count and latest migration version.
+
+        Both values come back in one round trip. Nothing is cached, so
+        later callers see migrations and schema changes made since startup.
+
+        Returns:
+            Tuple of (table count, migration version or None)
+        """
+        async with self.acquire() as conn:
+            try:
+                row = await conn.fetchrow(
+                    """
+                    SELECT
+                        (SELECT count(*) FROM pg_tables WHERE schemaname = 'public'),
+                        (SELECT MAX(version) FROM migrations)
+                    """
+                )
+                return (row[0], row[1])
+            except asyncpg.UndefinedTableError:
+                # Fresh database without a migrations table yet
+                table_count = await conn.fetchval(
+                    "SELECT count(*) FROM pg_tables WHERE schemaname = 'public'"
+                )
+                return (table_count, None)
+
     async def needs_initialization(self) -> bool:
         """
         Check if database needs initialization.
@@ -360,12 +801,8 @@ class DatabaseConnectionManager:
             True if database needs initialization
         """
         try:
-            async with self.acquire() as conn:
-                result = await conn.fetch(
-                    "SELECT tablename FROM pg_tables WHERE schemaname = 'public'"
-                )
-
-            return len(result) == 0
+            table_count, _ = await self._probe_state()
+            return table_count == 0
 
         except Exception as e:
             logger.error(f"Failed to check database initialization status: {e}")
@@ -373,165 +810,9 @@ class DatabaseConnectionManager:
     
     async def initialize_schema(self):
         """Initialize database schema."""
-        schema_sql = """
-        CREATE TABLE IF NOT EXISTS migrations (
-            id SERIAL PRIMARY KEY,
-            version INTEGER NOT NULL UNIQUE,
-            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-        
-        CREATE TABLE IF NOT EXISTS users (
-            id VARCHAR(36) PRIMARY KEY,
-            email VARCHAR(255) UNIQUE NOT NULL,
-            password_hash VARCHAR(255) NOT NULL,
-            first_name VARCHAR(100),
-            last_name VARCHAR(100),
-            role VARCHAR(20) NOT NULL DEFAULT 'USER',
-            is_active BOOLEAN NOT NULL DEFAULT TRUE,
-            created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
-            last_login_at TIMESTAMPTZ
-        );
-        
-        CREATE TABLE IF NOT EXISTS data_records (
-            id SERIAL PRIMARY KEY,
-            user_id VARCHAR(36) REFERENCES users(id) ON DELETE CASCADE,
-            data JSONB NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-        
-        -- SYSTEM RESTART PERSISTENCE TABLES (Phase 7.6.4)
-        
-        CREATE TABLE IF NOT EXISTS system_states (
-            id VARCHAR(255) PRIMARY KEY,
-            state_data JSONB NOT NULL,
-            created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
-        );
-        
-        CREATE TABLE IF NOT EXISTS active_executions (
-            id SERIAL PRIMARY KEY,
-            execution_id VARCHAR(255) NOT NULL,
-            function_id VARCHAR(255) NOT NULL,
-            user_id VARCHAR(255),
-            execution_data JSONB NOT NULL,
-            created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
-        );
-        
-        CREATE TABLE IF NOT EXISTS resource_pool_states (
-            pool_id VARCHAR(255) PRIMARY KEY,
-            resource_data JSONB NOT NULL,
-            created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
-        );
-        
-        CREATE TABLE IF NOT EXISTS audit_logs (
-            id SERIAL PRIMARY KEY,
-            request_id VARCHAR(255) NOT NULL,
-            user_id VARCHAR(255),
-            function_id VARCHAR(255),
-            event_type VARCHAR(100) NOT NULL,
-            event_data JSONB NOT NULL,
-            success BOOLEAN DEFAULT true,
-            created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
-        );
-        
-        CREATE TABLE IF NOT EXISTS performance_metrics (
-            id SERIAL PRIMARY KEY,
-            function_id VARCHAR(255) NOT NULL,
-            execution_time_ms INTEGER NOT NULL,
-            memory_used_mb FLOAT NOT NULL,
-            success BOOLEAN NOT NULL,
-            created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
-        );
-        
-        CREATE TABLE IF NOT EXISTS system_checkpoints (
-            id VARCHAR(255) PRIMARY KEY,
-            checkpoint_data JSONB NOT NULL,
-            created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
-        );
-        
-        -- Create indexes for performance
-        CREATE INDEX IF NOT EXISTS idx_system_states_created_at ON system_states(created_at DESC);
-        CREATE INDEX IF NOT EXISTS idx_active_executions_function_id ON active_executions(function_id);
-        CREATE INDEX IF NOT EXISTS idx_audit_logs_created_at ON audit_logs(created_at DESC);
-        CREATE INDEX IF NOT EXISTS idx_audit_logs_request_id ON audit_logs(request_id);
-        CREATE INDEX IF NOT EXISTS idx_performance_metrics_function_id ON performance_metrics(function_id);
-        CREATE INDEX IF NOT EXISTS idx_performance_metrics_created_at ON performance_metrics(created_at DESC);
-        CREATE INDEX IF NOT EXISTS idx_system_checkpoints_created_at ON system_checkpoints(created_at DESC);
-        
-        -- REALTIME NOTIFY TRIGGERS (Added for Phoenix integration)
-        
-        -- Generic notify function for all tables
-        CREATE OR REPLACE FUNCTION notify_table_change()
-        RETURNS TRIGGER AS $$
-        DECLARE
-          payload JSON;
-        BEGIN
-          IF (TG_OP = 'DELETE') THEN
-            payload = json_build_object(
-              'action', TG_OP,
-              'table', TG_TABLE_NAME,
-              'old_data', row_to_json(OLD),
-              'timestamp', NOW()
-            );
-          ELSE
-            payload = json_build_object(
-              'action', TG_OP,
-              'table', TG_TABLE_NAME,
-              'new_data', row_to_json(NEW),
-              'old_data', CASE WHEN TG_OP = 'UPDATE' THEN row_to_json(OLD) ELSE NULL END,
-              'timestamp', NOW()
-            );
-          END IF;
-
-          PERFORM pg_notify(TG_TABLE_NAME || '_events', payload::text);
-          
-          RETURN CASE WHEN TG_OP = 'DELETE' THEN OLD ELSE NEW END;
-        END;
-        $$ LANGUAGE plpgsql;
-
-        -- Drop existing triggers if they exist (idempotent)
-        DROP TRIGGER IF EXISTS users_notify ON users;
-        DROP TRIGGER IF EXISTS files_notify ON files;
-        DROP TRIGGER IF EXISTS buckets_notify ON buckets;
-        DROP TRIGGER IF EXISTS functions_notify ON functions;
-        DROP TRIGGER IF EXISTS tables_notify ON tables;
-        DROP TRIGGER IF EXISTS webhooks_notify ON webhooks;
-        DROP TRIGGER IF EXISTS webhook_deliveries_notify ON webhook_deliveries;
-
-        -- Create triggers
-        CREATE TRIGGER users_notify 
-          AFTER INSERT OR UPDATE OR DELETE ON users
-          FOR EACH ROW EXECUTE FUNCTION notify_table_change();
-
-        CREATE TRIGGER files_notify 
-          AFTER INSERT OR UPDATE OR DELETE ON files
-          FOR EACH ROW EXECUTE FUNCTION notify_table_change();
-
-        CREATE TRIGGER buckets_notify 
-          AFTER INSERT OR UPDATE OR DELETE ON buckets
-          FOR EACH ROW EXECUTE FUNCTION notify_table_change();
-
-        CREATE TRIGGER functions_notify 
-          AFTER INSERT OR UPDATE OR DELETE ON functions
-          FOR EACH ROW EXECUTE FUNCTION notify_table_change();
-
-        CREATE TRIGGER tables_notify 
-          AFTER INSERT OR UPDATE OR DELETE ON tables
-          FOR EACH ROW EXECUTE FUNCTION notify_table_change();
-
-        CREATE TRIGGER webhooks_notify 
-          AFTER INSERT OR UPDATE OR DELETE ON webhooks
-          FOR EACH ROW EXECUTE FUNCTION notify_table_change();
-
-        CREATE TRIGGER webhook_deliveries_notify 
-          AFTER INSERT OR UPDATE OR DELETE ON webhook_deliveries
-          FOR EACH ROW EXECUTE FUNCTION notify_table_change();
-        """
-        
         try:
             async with self.acquire() as conn:
-                await conn.execute(schema_sql)
+                await conn.execute(DDL_BUNDLE)
 
             logger.info("Database schema initialized successfully")
 
@@ -568,7 +849,7 @@ class DatabaseConnectionManager:
             # Hash the admin password
             password_hash = bcrypt.hashpw(
                 admin_password.encode('utf-8'),
-                bcrypt.gensalt(rounds=12)
+                bcrypt.gensalt(rounds=get_bcrypt_rounds())
             ).decode('utf-8')
 
             # Create admin user
@@ -602,10 +883,8 @@ class DatabaseConnectionManager:
         """
         try:
             # Get current migration version
-            async with self.acquire() as conn:
-                current_version = await conn.fetchval(
-                    "SELECT COALESCE(MAX(version), 0) FROM migrations"
-                ) or 0
+            _, current_version = await self._probe_state()
+            current_version = current_version or 0
 
             # For now, just return 0 as no migrations are defined yet
             # In a real implementation, this would execute migration files
@@ -693,16 +972,19 @@ class DatabaseConnectionManager:
                 VALUES ($1, $2, $3, $4, $5)
             """
             
+            rows = [
+                (
+                    execution.get("execution_id", "unknown"),
+                    execution.get("function_id"),
+                    execution.get("user_id"),
+                    json.dumps(execution),
+                    datetime.now(timezone.utc)
+                )
+                for execution in active_executions
+            ]
+            
             async with self.acquire() as conn:
-                for execution in active_executions:
-                    await conn.execute(
-                        sql,
-                        execution.get("execution_id", "unknown"),
-                        execution.get("function_id"),
-                        execution.get("user_id"),
-                        json.dumps(execution),
-                        datetime.now(timezone.utc)
-                    )
+                await conn.executemany(sql, rows)
             
             logger.info(f"Saved {len(active_executions)} active executions")
             
@@ -963,4 +1245,36 @@ class DatabaseConnectionManager:
                 
         except Exception as e:
             logger.error(f"Failed to restore from checkpoint: {e}")
-            return None
\ No newline at end of file
+            return None
+
+
+# Manager shared by request-scoped callers in this process, so each request
+# reuses one pool instead of opening its own
+_shared_manager: Optional[DatabaseConnectionManager] = None
+
+
+def get_shared_connection_manager(config_manager: Optional[ConfigManager] = None) -> DatabaseConnectionManager:
+    """
+    Return the process-wide DatabaseConnectionManager, creating it on first use.
+
+    Args:
+        config_manager: Configuration used only when the manager is created
+
+    Returns:
+        The shared DatabaseConnectionManager
+    """
+    global _shared_manager
+    if _shared_manager is None:
+        _shared_manager = DatabaseConnectionManager(config_manager or ConfigManager())
+    return _shared_manager
+
+
+async def close_shared_connection_manager() -> None:
+    """
+    Close the process-wide manager's pool, if it was ever created.
+
+    The manager itself is kept, since endpoint modules hold it from import
+    time; its pool is recreated on the next acquire().
+    """
+    if _shared_manager is not None:
+        await _shared_manager.close()
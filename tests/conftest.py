@@ -14,17 +14,26 @@ import os
 import sys
 import asyncio
 import importlib
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, MagicMock, AsyncMock
 from pathlib import Path
+from dataclasses import dataclass
 from typing import Dict, Any, Optional
 import tempfile
 import logging
 from fastapi.testclient import TestClient
 
+try:
+    import uvloop
+except ImportError:  # optional speed-up; not available on Windows
+    uvloop = None
+
 # Configure logging for tests
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Use the minimum bcrypt cost so password hashing doesn't dominate test time
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
 # Set up Python path for backend imports
 # This allows backend code to use relative imports (Docker style) while tests run locally
 _project_root = Path(__file__).resolve().parent.parent
@@ -87,6 +96,28 @@ def api_client(test_environment):
         yield client
 
 
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_api_client(test_environment):
+    """httpx AsyncClient calling the backend app in-process over ASGI.
+
+    Built once per session; skips the TestClient thread and lifespan startup.
+    Tests that point API_KEY/JWT_SECRET_KEY elsewhere need the per-test api_client,
+    which reloads the app against the current environment.
+    """
+    from httpx import AsyncClient, ASGITransport
+
+    # The auth middleware reads its keys once, when the middleware stack is built;
+    # other tests may have popped them from os.environ by then, so build it now.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('API_KEY', test_environment['API_KEY'])
+        mp.setenv('JWT_SECRET_KEY', test_environment['JWT_SECRET_KEY'])
+        app = _load_backend_app()
+        app.middleware_stack = app.build_middleware_stack()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_imports():
     """
@@ -231,6 +262,60 @@ def dev_config_manager(test_environment):
         return mock_config_manager(test_environment)
 
 
+# Database connection manager fixtures
+
+@dataclass(frozen=True, slots=True)
+class _Cfg:
+    """Read-only stand-in for the ConfigManager attributes DatabaseConnectionManager reads."""
+    pgbouncer_host: str = "pgbouncer"
+    pgbouncer_port: int = 6432
+    postgres_host: str = "localhost"
+    postgres_port: int = 5432
+    postgres_db: str = "testdb"
+    postgres_user: str = "testuser"
+    postgres_password: str = "testpass"
+    is_docker_environment: bool = False
+    compose_project_name: str = "selfdb"
+    admin_email: Optional[str] = None
+    admin_password: Optional[str] = None
+    admin_first_name: Optional[str] = None
+    admin_last_name: Optional[str] = None
+
+
+@pytest.fixture(scope="module")
+def config_manager():
+    """Bare Postgres configuration shared by every test in a module."""
+    return _Cfg()
+
+
+@pytest.fixture(scope="module")
+def docker_config_manager():
+    """Docker configuration where connections go through PgBouncer."""
+    return _Cfg(
+        postgres_db="selfdb",
+        postgres_user="selfdb_user",
+        postgres_password="selfdb_pass",
+        is_docker_environment=True,
+    )
+
+
+@pytest.fixture
+def mock_create_pool(monkeypatch):
+    """
+    Replace asyncpg.create_pool for one test and hand back the mock.
+
+    By default it returns a working fake pool whose connections are
+    AsyncMocks; tests override return_value or side_effect as needed.
+    """
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__.return_value = AsyncMock()
+    pool.is_closing.return_value = False
+    pool.close = AsyncMock()
+    create_pool = AsyncMock(return_value=pool)
+    monkeypatch.setattr("asyncpg.create_pool", create_pool)
+    return create_pool
+
+
 @pytest.fixture(scope="session")
 def test_api_key(test_environment):
     """Test API key from development environment."""
@@ -689,6 +774,9 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "integration: mark test as integration test")
     config.addinivalue_line("markers", "docker: mark test as requiring Docker")
     config.addinivalue_line("markers", "slow: mark test as slow running")
+    # pytest-xdist only honours xdist_group under `pytest -n auto --dist loadgroup`;
+    # registered here so modules can set it without warnings when xdist is absent.
+    config.addinivalue_line("markers", "xdist_group(name): keep marked tests on one xdist worker")
 
 
 def pytest_collection_modifyitems(config, items):
@@ -703,6 +791,16 @@ def pytest_collection_modifyitems(config, items):
             item.add_marker(pytest.mark.docker)
 
 
+# The services run under uvicorn[standard], which installs uvloop as the event
+# loop, so async tests use it too when it is installed. Standalone scripts that
+# want the same scheduling should call uvloop.install() before asyncio.run().
+if uvloop is not None:
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop, the loop uvicorn uses in the containers."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
 # Concurrent function execution fixtures
 
 @pytest.fixture(scope="session")
@@ -98,10 +98,12 @@ class TestTransactionManagementIntegration:
             await tx.execute("INSERT INTO test_users (name) VALUES ($1)", "test_user_2")
         
         # Assert - Verify data was committed
-        count = await db_manager._connection.fetchval("SELECT COUNT(*) FROM test_users")
+        async with db_manager.acquire() as conn:
+            count = await conn.fetchval("SELECT COUNT(*) FROM test_users")
         assert count == 2
         
-        names = await db_manager._connection.fetch("SELECT name FROM test_users ORDER BY id")
+        async with db_manager.acquire() as conn:
+            names = await conn.fetch("SELECT name FROM test_users ORDER BY id")
         assert [record['name'] for record in names] == ["test_user_1", "test_user_2"]
     
     async def test_transaction_rollback_on_error(self, db_manager_with_schema):
@@ -116,7 +118,8 @@ class TestTransactionManagementIntegration:
                 raise ValueError("Simulated error")
         
         # Assert - Verify no data was committed due to rollback
-        count = await db_manager._connection.fetchval("SELECT COUNT(*) FROM test_users")
+        async with db_manager.acquire() as conn:
+            count = await conn.fetchval("SELECT COUNT(*) FROM test_users")
         assert count == 0
     
     async def test_nested_transactions_savepoints(self, db_manager_with_schema):
@@ -140,10 +143,12 @@ class TestTransactionManagementIntegration:
             await outer_tx.execute("INSERT INTO test_users (name) VALUES ($1)", "outer_user_2")
         
         # Assert - Only outer transaction data should be committed
-        count = await db_manager._connection.fetchval("SELECT COUNT(*) FROM test_users")
+        async with db_manager.acquire() as conn:
+            count = await conn.fetchval("SELECT COUNT(*) FROM test_users")
         assert count == 2
         
-        names = await db_manager._connection.fetch("SELECT name FROM test_users ORDER BY id")
+        async with db_manager.acquire() as conn:
+            names = await conn.fetch("SELECT name FROM test_users ORDER BY id")
         committed_names = [record['name'] for record in names]
         assert "outer_user" in committed_names
         assert "outer_user_2" in committed_names
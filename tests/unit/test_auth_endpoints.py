@@ -6,23 +6,68 @@ Following TDD methodology - tests written before implementation.
 """
 
 import pytest
-from unittest.mock import Mock, AsyncMock, patch
-from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from unittest.mock import Mock, AsyncMock
+from datetime import datetime, timezone
+from typing import Dict, Any
+
+from shared.auth.auth_endpoints import AuthEndpoints
+from shared.auth.jwt_service import JWTService
+
+
+_FIXED_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _payload(user, **overrides) -> Dict[str, Any]:
+    """Build the JWT payload for a user object."""
+    return {
+        "user_id": user.id,
+        "email": user.email,
+        "role": user.role,
+        "is_active": user.is_active,
+        **overrides
+    }
+
+
+def _assert_error(result: Dict[str, Any], code: str) -> None:
+    """Assert that an endpoint result is a failure with the given error code."""
+    assert result["success"] is False
+    assert result["error"]["code"] == code
+
+
+class _StubUserStore:
+    """Async user store stub whose lookups return a preset user."""
+    
+    def __init__(self, preset_user=None):
+        self.preset_user = preset_user
+    
+    async def get_user_by_email(self, email):
+        return self.preset_user
+    
+    async def get_user_by_id(self, user_id):
+        return self.preset_user
+    
+    async def create_user(self, **kwargs):
+        return self.preset_user
+    
+    async def update_user_last_login(self, user_id):
+        return None
+    
+    async def update_user_password(self, user_id, password_hash):
+        return True
+
+
+@pytest.fixture(scope="module")
+def api_key():
+    """Valid API key for testing."""
+    return "test_api_key_auth"
 
 
 class TestAuthEndpoints:
     """Test suite for authentication endpoints."""
     
-    @pytest.fixture
-    def api_key(self):
-        """Valid API key for testing."""
-        return "test_api_key_auth"
-    
     @pytest.fixture
     def jwt_service(self):
         """JWT service for testing."""
-        from shared.auth.jwt_service import JWTService
         return JWTService(
             secret_key="test_auth_secret",
             algorithm="HS256",
@@ -40,6 +85,11 @@ class TestAuthEndpoints:
         store.update_user_last_login = AsyncMock()
         return store
     
+    @pytest.fixture
+    def user_store(self):
+        """Cheap user store stub for tests that only need lookup results."""
+        return _StubUserStore()
+    
     @pytest.fixture
     def sample_user_data(self):
         """Sample user data for registration."""
@@ -59,16 +109,31 @@ class TestAuthEndpoints:
         user.password_hash = "$2b$12$hash_here"  # Mock bcrypt hash
         user.role = "USER"
         user.is_active = True
-        user.created_at = datetime.now(timezone.utc)
+        user.created_at = _FIXED_NOW
         user.last_login = None
         return user
     
+    @pytest.fixture
+    def auth_endpoints(self, api_key, jwt_service, user_store):
+        """AuthEndpoints instance bound to this test's collaborators."""
+        return AuthEndpoints(api_key=api_key, jwt_service=jwt_service, user_store=user_store)
+    
+    @pytest.fixture
+    def bcrypt_pass(self, monkeypatch):
+        """Make bcrypt password checks succeed."""
+        monkeypatch.setattr("bcrypt.checkpw", lambda *args, **kwargs: True)
+    
+    @pytest.fixture
+    def bcrypt_fail(self, monkeypatch):
+        """Make bcrypt password checks fail."""
+        monkeypatch.setattr("bcrypt.checkpw", lambda *args, **kwargs: False)
+    
     @pytest.mark.asyncio
     async def test_register_new_user_success(
-        self, api_key, jwt_service, mock_user_store, sample_user_data
+        self, api_key, auth_endpoints, mock_user_store, sample_user_data
     ):
         """Test successful user registration."""
-        from shared.auth.auth_endpoints import AuthEndpoints
+        auth_endpoints.user_store = mock_user_store  # Record store calls
         
         # Mock that user doesn't exist
         mock_user_store.get_user_by_email.return_value = None
@@ -81,12 +146,6 @@ class TestAuthEndpoints:
         new_user.is_active = True
         mock_user_store.create_user.return_value = new_user
         
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
-        
         result = await auth_endpoints.register(
             api_key=api_key,
             **sample_user_data
@@ -105,41 +164,30 @@ class TestAuthEndpoints:
     
     @pytest.mark.asyncio
     async def test_register_user_already_exists(
-        self, api_key, jwt_service, mock_user_store, sample_user_data, existing_user
+        self, api_key, auth_endpoints, user_store, sample_user_data, existing_user
     ):
         """Test registration when user already exists."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
         # Mock that user already exists
-        mock_user_store.get_user_by_email.return_value = existing_user
-        
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
+        user_store.preset_user = existing_user
         
         result = await auth_endpoints.register(
             api_key=api_key,
             **sample_user_data
         )
         
-        assert result["success"] is False
-        assert result["error"]["code"] == "USER_ALREADY_EXISTS"
+        _assert_error(result, "USER_ALREADY_EXISTS")
         assert "email" in result["error"]["message"]
         assert result["error"]["details"]["email"] == sample_user_data["email"]
     
     @pytest.mark.asyncio
     async def test_register_invalid_api_key(
-        self, jwt_service, mock_user_store, sample_user_data
+        self, jwt_service, user_store, sample_user_data
     ):
         """Test registration with invalid API key."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
         auth_endpoints = AuthEndpoints(
             api_key="correct_key",
             jwt_service=jwt_service,
-            user_store=mock_user_store
+            user_store=user_store
         )
         
         result = await auth_endpoints.register(
@@ -147,83 +195,47 @@ class TestAuthEndpoints:
             **sample_user_data
         )
         
-        assert result["success"] is False
-        assert result["error"]["code"] == "INVALID_API_KEY"
+        _assert_error(result, "INVALID_API_KEY")
     
     @pytest.mark.asyncio
-    async def test_register_missing_required_fields(
-        self, api_key, jwt_service, mock_user_store
+    @pytest.mark.parametrize(
+        "email,password,expected_code,msg_contains",
+        [
+            ("", "password123", "VALIDATION_ERROR", "email"),  # Missing email
+            ("user@example.com", "weak", "WEAK_PASSWORD", "8 characters"),  # Too short
+        ],
+    )
+    async def test_register_validation_errors(
+        self, api_key, auth_endpoints, email, password, expected_code, msg_contains
     ):
-        """Test registration with missing required fields."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
-        
-        # Test missing email (pass empty string)
+        """Test registration rejects missing fields and weak passwords."""
         result = await auth_endpoints.register(
             api_key=api_key,
-            email="",  # Empty email
-            password="password123",
+            email=email,
+            password=password,
             first_name="John",
             last_name="Doe"
         )
         
-        assert result["success"] is False
-        assert result["error"]["code"] == "VALIDATION_ERROR"
-        assert "email" in result["error"]["message"]
-    
-    @pytest.mark.asyncio
-    async def test_register_weak_password(
-        self, api_key, jwt_service, mock_user_store
-    ):
-        """Test registration with weak password."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
-        
-        result = await auth_endpoints.register(
-            api_key=api_key,
-            email="user@example.com",
-            password="weak",  # Too short
-            first_name="John",
-            last_name="Doe"
-        )
-        
-        assert result["success"] is False
-        assert result["error"]["code"] == "WEAK_PASSWORD"
-        assert "8 characters" in result["error"]["message"]
+        _assert_error(result, expected_code)
+        assert msg_contains in result["error"]["message"]
     
     @pytest.mark.asyncio
     async def test_login_success(
-        self, api_key, jwt_service, mock_user_store, existing_user
+        self, api_key, auth_endpoints, mock_user_store, existing_user, bcrypt_pass
     ):
         """Test successful login."""
-        from shared.auth.auth_endpoints import AuthEndpoints
+        auth_endpoints.user_store = mock_user_store  # Record store calls
         
         # Mock user exists and password verification
         mock_user_store.get_user_by_email.return_value = existing_user
         
-        auth_endpoints = AuthEndpoints(
+        result = await auth_endpoints.login(
             api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
+            email=existing_user.email,
+            password="correct_password"
         )
         
-        with patch('bcrypt.checkpw', return_value=True):
-            result = await auth_endpoints.login(
-                api_key=api_key,
-                email=existing_user.email,
-                password="correct_password"
-            )
-        
         assert result["success"] is True
         assert result["user"]["id"] == existing_user.id
         assert result["user"]["email"] == existing_user.email
@@ -237,19 +249,11 @@ class TestAuthEndpoints:
     
     @pytest.mark.asyncio
     async def test_login_user_not_found(
-        self, api_key, jwt_service, mock_user_store
+        self, api_key, auth_endpoints, user_store
     ):
         """Test login with non-existent user."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
         # Mock user doesn't exist
-        mock_user_store.get_user_by_email.return_value = None
-        
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
+        user_store.preset_user = None
         
         result = await auth_endpoints.login(
             api_key=api_key,
@@ -257,42 +261,29 @@ class TestAuthEndpoints:
             password="password123"
         )
         
-        assert result["success"] is False
-        assert result["error"]["code"] == "INVALID_CREDENTIALS"
+        _assert_error(result, "INVALID_CREDENTIALS")
         assert "email or password" in result["error"]["message"]
     
     @pytest.mark.asyncio
     async def test_login_wrong_password(
-        self, api_key, jwt_service, mock_user_store, existing_user
+        self, api_key, auth_endpoints, user_store, existing_user, bcrypt_fail
     ):
         """Test login with wrong password."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
-        mock_user_store.get_user_by_email.return_value = existing_user
+        user_store.preset_user = existing_user
         
-        auth_endpoints = AuthEndpoints(
+        result = await auth_endpoints.login(
             api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
+            email=existing_user.email,
+            password="wrong_password"
         )
         
-        with patch('bcrypt.checkpw', return_value=False):
-            result = await auth_endpoints.login(
-                api_key=api_key,
-                email=existing_user.email,
-                password="wrong_password"
-            )
-        
-        assert result["success"] is False
-        assert result["error"]["code"] == "INVALID_CREDENTIALS"
+        _assert_error(result, "INVALID_CREDENTIALS")
     
     @pytest.mark.asyncio
     async def test_login_inactive_user(
-        self, api_key, jwt_service, mock_user_store
+        self, api_key, auth_endpoints, user_store, bcrypt_pass
     ):
         """Test login with inactive user."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
         inactive_user = Mock()
         inactive_user.id = "inactive_123"
         inactive_user.email = "inactive@example.com"
@@ -300,48 +291,26 @@ class TestAuthEndpoints:
         inactive_user.role = "USER"
         inactive_user.is_active = False  # Inactive user
         
-        mock_user_store.get_user_by_email.return_value = inactive_user
+        user_store.preset_user = inactive_user
         
-        auth_endpoints = AuthEndpoints(
+        result = await auth_endpoints.login(
             api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
+            email=inactive_user.email,
+            password="correct_password"
         )
         
-        with patch('bcrypt.checkpw', return_value=True):
-            result = await auth_endpoints.login(
-                api_key=api_key,
-                email=inactive_user.email,
-                password="correct_password"
-            )
-        
-        assert result["success"] is False
-        assert result["error"]["code"] == "ACCOUNT_INACTIVE"
+        _assert_error(result, "ACCOUNT_INACTIVE")
         assert result["error"]["details"]["user_id"] == inactive_user.id
     
     @pytest.mark.asyncio
     async def test_refresh_token_success(
-        self, api_key, jwt_service, mock_user_store, existing_user
+        self, api_key, auth_endpoints, jwt_service, user_store, existing_user
     ):
         """Test successful token refresh."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
         # Generate valid refresh token
-        user_payload = {
-            "user_id": existing_user.id,
-            "email": existing_user.email,
-            "role": existing_user.role,
-            "is_active": existing_user.is_active
-        }
-        refresh_token = jwt_service.generate_refresh_token(user_payload)
+        refresh_token = jwt_service.generate_refresh_token(_payload(existing_user))
         
-        mock_user_store.get_user_by_id.return_value = existing_user
-        
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
+        user_store.preset_user = existing_user
         
         result = await auth_endpoints.refresh_token(
             api_key=api_key,
@@ -356,32 +325,21 @@ class TestAuthEndpoints:
     
     @pytest.mark.asyncio
     async def test_refresh_token_invalid(
-        self, api_key, jwt_service, mock_user_store
+        self, api_key, auth_endpoints
     ):
         """Test refresh with invalid token."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
-        
         result = await auth_endpoints.refresh_token(
             api_key=api_key,
             refresh_token="invalid.refresh.token"
         )
         
-        assert result["success"] is False
-        assert result["error"]["code"] == "INVALID_REFRESH_TOKEN"
+        _assert_error(result, "INVALID_REFRESH_TOKEN")
     
     @pytest.mark.asyncio
     async def test_refresh_token_user_not_found(
-        self, api_key, jwt_service, mock_user_store
+        self, api_key, auth_endpoints, jwt_service, user_store
     ):
         """Test refresh when user no longer exists."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
         # Generate token for non-existent user
         user_payload = {
             "user_id": "deleted_user_789",
@@ -391,83 +349,51 @@ class TestAuthEndpoints:
         }
         refresh_token = jwt_service.generate_refresh_token(user_payload)
         
-        mock_user_store.get_user_by_id.return_value = None  # User doesn't exist
-        
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
+        user_store.preset_user = None  # User doesn't exist
         
         result = await auth_endpoints.refresh_token(
             api_key=api_key,
             refresh_token=refresh_token
         )
         
-        assert result["success"] is False
-        assert result["error"]["code"] == "USER_NOT_FOUND"
+        _assert_error(result, "USER_NOT_FOUND")
         assert result["error"]["details"]["user_id"] == "deleted_user_789"
     
     @pytest.mark.asyncio
     async def test_refresh_token_inactive_user(
-        self, api_key, jwt_service, mock_user_store
+        self, api_key, auth_endpoints, jwt_service, user_store
     ):
         """Test refresh for inactive user."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
         inactive_user = Mock()
         inactive_user.id = "inactive_456"
         inactive_user.email = "inactive@example.com"
         inactive_user.role = "USER"
         inactive_user.is_active = False
         
-        user_payload = {
-            "user_id": inactive_user.id,
-            "email": inactive_user.email,
-            "role": inactive_user.role,
-            "is_active": True  # Token was valid when issued
-        }
-        refresh_token = jwt_service.generate_refresh_token(user_payload)
-        
-        mock_user_store.get_user_by_id.return_value = inactive_user
-        
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
+        # Token was valid when issued
+        refresh_token = jwt_service.generate_refresh_token(
+            _payload(inactive_user, is_active=True)
         )
         
+        user_store.preset_user = inactive_user
+        
         result = await auth_endpoints.refresh_token(
             api_key=api_key,
             refresh_token=refresh_token
         )
         
-        assert result["success"] is False
-        assert result["error"]["code"] == "ACCOUNT_INACTIVE"
+        _assert_error(result, "ACCOUNT_INACTIVE")
     
     @pytest.mark.asyncio
     async def test_logout_success(
-        self, api_key, jwt_service, mock_user_store, existing_user
+        self, api_key, auth_endpoints, jwt_service, existing_user
     ):
         """Test successful logout (token blacklisting)."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
         # Generate tokens
-        user_payload = {
-            "user_id": existing_user.id,
-            "email": existing_user.email,
-            "role": existing_user.role,
-            "is_active": existing_user.is_active
-        }
+        user_payload = _payload(existing_user)
         access_token = jwt_service.generate_access_token(user_payload)
         refresh_token = jwt_service.generate_refresh_token(user_payload)
         
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
-        
         result = await auth_endpoints.logout(
             api_key=api_key,
             access_token=access_token,
@@ -483,17 +409,9 @@ class TestAuthEndpoints:
     
     @pytest.mark.asyncio
     async def test_logout_invalid_tokens(
-        self, api_key, jwt_service, mock_user_store
+        self, api_key, auth_endpoints
     ):
         """Test logout with invalid tokens."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
-        
         result = await auth_endpoints.logout(
             api_key=api_key,
             access_token="invalid.access.token",
@@ -506,27 +424,13 @@ class TestAuthEndpoints:
     
     @pytest.mark.asyncio
     async def test_get_current_user(
-        self, api_key, jwt_service, mock_user_store, existing_user
+        self, api_key, auth_endpoints, jwt_service, user_store, existing_user
     ):
         """Test getting current user from token."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
         # Generate valid token
-        user_payload = {
-            "user_id": existing_user.id,
-            "email": existing_user.email,
-            "role": existing_user.role,
-            "is_active": existing_user.is_active
-        }
-        access_token = jwt_service.generate_access_token(user_payload)
+        access_token = jwt_service.generate_access_token(_payload(existing_user))
         
-        mock_user_store.get_user_by_id.return_value = existing_user
-        
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
+        user_store.preset_user = existing_user
         
         result = await auth_endpoints.get_current_user(
             api_key=api_key,
@@ -539,10 +443,10 @@ class TestAuthEndpoints:
         assert result["user"]["role"] == existing_user.role
 
     @pytest.mark.asyncio
-    async def test_change_password_success(self, api_key, jwt_service, mock_user_store):
+    async def test_change_password_success(self, api_key, auth_endpoints, mock_user_store, bcrypt_pass):
         """Test change password flow (user changes own password)."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-
+        auth_endpoints.user_store = mock_user_store  # Record store calls
+        
         # Prepare mock user
         user = Mock()
         user.id = "user_change_1"
@@ -556,64 +460,44 @@ class TestAuthEndpoints:
         mock_user_store.get_user_by_id.side_effect = fake_get_user_by_id
         mock_user_store.update_user_password = AsyncMock(return_value=True)
 
-        auth_endpoints = AuthEndpoints(
+        # Simulate correct current password
+        result = await auth_endpoints.change_password(
             api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
+            user_id=user.id,
+            current_password="OldPass123!",
+            new_password="NewPass123!"
         )
 
-        # Simulate correct current password
-        with patch('bcrypt.checkpw', return_value=True):
-            result = await auth_endpoints.change_password(
-                api_key=api_key,
-                user_id=user.id,
-                current_password="OldPass123!",
-                new_password="NewPass123!"
-            )
-
         assert result["success"] is True
         mock_user_store.update_user_password.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_change_password_wrong_current(self, api_key, jwt_service, mock_user_store):
+    async def test_change_password_wrong_current(self, api_key, auth_endpoints, user_store, bcrypt_fail):
         """Test change password fails when current password is wrong."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-
         user = Mock()
         user.id = "user_change_2"
         user.email = "change2@test.com"
         user.hashed_password = "$2b$12$fakehash"
         user.is_active = True
 
-        async def fake_get_user_by_id(uid):
-            return user
-
-        mock_user_store.get_user_by_id.side_effect = fake_get_user_by_id
-        mock_user_store.update_user_password = AsyncMock(return_value=True)
+        user_store.preset_user = user
 
-        auth_endpoints = AuthEndpoints(
+        # Simulate wrong current password
+        result = await auth_endpoints.change_password(
             api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
+            user_id=user.id,
+            current_password="WrongOld",
+            new_password="NewPass123!"
         )
 
-        # Simulate wrong current password
-        with patch('bcrypt.checkpw', return_value=False):
-            result = await auth_endpoints.change_password(
-                api_key=api_key,
-                user_id=user.id,
-                current_password="WrongOld",
-                new_password="NewPass123!"
-            )
-
         assert result["success"] is False
         assert result["error"]["code"] in ("INVALID_CREDENTIALS", "WEAK_PASSWORD", "VALIDATION_ERROR") or "password" in result.get("error", {}).get("message", "")
 
     @pytest.mark.asyncio
-    async def test_admin_set_user_password_success(self, api_key, jwt_service, mock_user_store):
+    async def test_admin_set_user_password_success(self, api_key, auth_endpoints, mock_user_store):
         """Test admin sets another user's password successfully."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-
+        auth_endpoints.user_store = mock_user_store  # Record store calls
+        
         admin_user = Mock()
         admin_user.id = "admin_1"
         admin_user.email = "admin@test.com"
@@ -631,12 +515,6 @@ class TestAuthEndpoints:
         mock_user_store.get_user_by_id.side_effect = fake_get_user_by_id
         mock_user_store.update_user_password = AsyncMock(return_value=True)
 
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
-
         result = await auth_endpoints.admin_set_user_password(
             api_key=api_key,
             admin_user_id=admin_user.id,
@@ -648,10 +526,10 @@ class TestAuthEndpoints:
         mock_user_store.update_user_password.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_admin_set_user_password_forbidden(self, api_key, jwt_service, mock_user_store):
+    async def test_admin_set_user_password_forbidden(self, api_key, auth_endpoints, mock_user_store):
         """Test admin set password is forbidden when caller is not admin."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-
+        auth_endpoints.user_store = mock_user_store  # Lookups dispatch on user id
+        
         non_admin = Mock()
         non_admin.id = "user_not_admin"
         non_admin.email = "notadmin@test.com"
@@ -669,12 +547,6 @@ class TestAuthEndpoints:
         mock_user_store.get_user_by_id.side_effect = fake_get_user_by_id
         mock_user_store.update_user_password = AsyncMock(return_value=True)
 
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
-
         result = await auth_endpoints.admin_set_user_password(
             api_key=api_key,
             admin_user_id=non_admin.id,
@@ -686,11 +558,9 @@ class TestAuthEndpoints:
     
     @pytest.mark.asyncio
     async def test_auth_endpoint_rate_limiting(
-        self, api_key, jwt_service, mock_user_store
+        self, api_key, jwt_service, bcrypt_fail
     ):
         """Test rate limiting for auth endpoints."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
         # Mock user with proper password hash
         rate_limit_user = Mock()
         rate_limit_user.id = "rate_limit_user"
@@ -699,53 +569,46 @@ class TestAuthEndpoints:
         rate_limit_user.role = "USER"
         rate_limit_user.is_active = True
         
-        mock_user_store.get_user_by_email.return_value = rate_limit_user
-        
         auth_endpoints = AuthEndpoints(
             api_key=api_key,
             jwt_service=jwt_service,
-            user_store=mock_user_store,
+            user_store=_StubUserStore(rate_limit_user),
             enable_rate_limiting=True,
             max_attempts_per_minute=3
         )
         
-        # Simulate rapid login attempts
-        with patch('bcrypt.checkpw', return_value=False):  # Wrong password
-            for i in range(4):  # One more than the limit
-                result = await auth_endpoints.login(
-                    api_key=api_key,
-                    email="test@example.com",
-                    password="password"
-                )
-                
-                if i < 3:
-                    # First 3 attempts should be processed (but fail due to invalid creds)
-                    assert result["error"]["code"] == "INVALID_CREDENTIALS"
-                else:
-                    # 4th attempt should be rate limited
-                    assert result["error"]["code"] == "RATE_LIMIT_EXCEEDED"
-    
-    def test_auth_endpoints_initialization(self, api_key, jwt_service, mock_user_store):
+        # Simulate rapid login attempts with a wrong password
+        for i in range(4):  # One more than the limit
+            result = await auth_endpoints.login(
+                api_key=api_key,
+                email="test@example.com",
+                password="password"
+            )
+            
+            if i < 3:
+                # First 3 attempts should be processed (but fail due to invalid creds)
+                _assert_error(result, "INVALID_CREDENTIALS")
+            else:
+                # 4th attempt should be rate limited
+                _assert_error(result, "RATE_LIMIT_EXCEEDED")
+    
+    def test_auth_endpoints_initialization(self, api_key, jwt_service, user_store):
         """Test AuthEndpoints initialization."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
         auth_endpoints = AuthEndpoints(
             api_key=api_key,
             jwt_service=jwt_service,
-            user_store=mock_user_store,
+            user_store=user_store,
             enable_rate_limiting=True,
             max_attempts_per_minute=5
         )
         
         assert auth_endpoints.api_key == api_key
         assert auth_endpoints.jwt_service == jwt_service
-        assert auth_endpoints.user_store == mock_user_store
+        assert auth_endpoints.user_store == user_store
         assert auth_endpoints.enable_rate_limiting is True
         assert auth_endpoints.max_attempts_per_minute == 5
     
-    def test_auth_endpoints_missing_jwt_service_raises_error(self, api_key, mock_user_store):
+    def test_auth_endpoints_missing_jwt_service_raises_error(self, api_key, user_store):
         """Test that AuthEndpoints requires a JWT service."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
         with pytest.raises(ValueError, match="JWT service must be provided"):
-            AuthEndpoints(api_key=api_key, jwt_service=None, user_store=mock_user_store)
\ No newline at end of file
+            AuthEndpoints(api_key=api_key, jwt_service=None, user_store=user_store)
\ No newline at end of file
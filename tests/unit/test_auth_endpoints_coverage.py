@@ -5,55 +5,130 @@ These tests cover edge cases and error conditions not covered by main tests.
 """
 
 import pytest
-from unittest.mock import Mock, patch
+import re
+from unittest.mock import patch
 from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from shared.auth.auth_endpoints import AuthEndpoints
+from shared.auth.jwt_service import JWTService
+
+
+_DELETED_USER_PAYLOAD = {
+    "user_id": "deleted_user_123",
+    "email": "deleted@example.com",
+    "role": "USER",
+    "is_active": True
+}
+
+
+class _FrozenDatetime(datetime):
+    """datetime whose now() is pinned, for deterministic rate-limit windows."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2024, 1, 1, 12, 0, 30, tzinfo=tz)
+
+
+@pytest.fixture(scope="module")
+def jwt_service():
+    """JWT service for testing, shared by the whole module."""
+    return JWTService(
+        secret_key="test_auth_secret",
+        algorithm="HS256", 
+        access_token_expire_minutes=30,
+        refresh_token_expire_hours=24 * 7
+    )
+
+
+@pytest.fixture(scope="module")
+def api_key():
+    """Valid API key for testing."""
+    return "test_api_key_auth"
+
+
+class _AsyncReturn:
+    """Awaitable stub that returns a preset value; much cheaper than AsyncMock."""
+
+    __slots__ = ("return_value",)
+
+    def __init__(self, return_value=None):
+        self.return_value = return_value
+
+    async def __call__(self, *args, **kwargs):
+        return self.return_value
+
+
+@pytest.fixture(scope="module")
+def shared_user_store():
+    """Stub user storage built once per module."""
+    return SimpleNamespace(
+        get_user_by_email=_AsyncReturn(),
+        get_user_by_id=_AsyncReturn(),
+        create_user=_AsyncReturn(),
+        update_user_last_login=_AsyncReturn()
+    )
+
+
+@pytest.fixture(scope="module")
+def auth_endpoints(api_key, jwt_service, shared_user_store):
+    """AuthEndpoints with default settings, shared by the whole module."""
+    return AuthEndpoints(
+        api_key=api_key,
+        jwt_service=jwt_service,
+        user_store=shared_user_store
+    )
+
+
+@pytest.fixture(scope="module")
+def auth_endpoints_factory(api_key, jwt_service, shared_user_store):
+    """Build AuthEndpoints with non-default settings, cached per keyword set."""
+    cache = {}
+
+    def make(**kwargs):
+        key = tuple(sorted(kwargs.items()))
+        if key not in cache:
+            cache[key] = AuthEndpoints(
+                api_key=api_key,
+                jwt_service=jwt_service,
+                user_store=shared_user_store,
+                **kwargs
+            )
+        return cache[key]
+
+    return make
+
+
+@pytest.fixture
+def mock_user_store(shared_user_store):
+    """Shared user store stub with return values reset."""
+    for method in vars(shared_user_store).values():
+        method.return_value = None
+    return shared_user_store
+
+
+@pytest.fixture(scope="module")
+def bcrypt_sample(auth_endpoints):
+    """Plain password and its bcrypt hash, computed once per module."""
+    return "testpassword123", auth_endpoints._hash_password("testpassword123")
+
+
+@pytest.fixture(scope="module")
+def deleted_user_token(jwt_service):
+    """Access token for a user missing from the store, signed once per module."""
+    return jwt_service.generate_access_token(_DELETED_USER_PAYLOAD)
 
 
 class TestAuthEndpointsEdgeCases:
     """Additional tests for auth endpoints edge cases."""
     
-    @pytest.fixture
-    def jwt_service(self):
-        """JWT service for testing."""
-        from shared.auth.jwt_service import JWTService
-        return JWTService(
-            secret_key="test_auth_secret",
-            algorithm="HS256", 
-            access_token_expire_minutes=30,
-            refresh_token_expire_hours=24 * 7
-        )
-    
-    @pytest.fixture
-    def api_key(self):
-        """Valid API key for testing."""
-        return "test_api_key_auth"
-    
-    @pytest.fixture
-    def mock_user_store(self):
-        """Mock user storage for testing."""
-        from unittest.mock import AsyncMock
-        store = Mock()
-        store.get_user_by_email = AsyncMock()
-        store.get_user_by_id = AsyncMock()
-        store.create_user = AsyncMock()
-        store.update_user_last_login = AsyncMock()
-        return store
-    
     @pytest.mark.asyncio
     async def test_register_invalid_email_format(
-        self, api_key, jwt_service, mock_user_store
+        self, api_key, auth_endpoints, mock_user_store
     ):
         """Test registration with invalid email format."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
         mock_user_store.get_user_by_email.return_value = None
         
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
-        
         result = await auth_endpoints.register(
             api_key=api_key,
             email="invalid-email",  # Invalid format
@@ -68,17 +143,9 @@ class TestAuthEndpointsEdgeCases:
     
     @pytest.mark.asyncio
     async def test_register_missing_multiple_fields(
-        self, api_key, jwt_service, mock_user_store
+        self, api_key, auth_endpoints
     ):
         """Test registration missing multiple required fields."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
-        
         result = await auth_endpoints.register(
             api_key=api_key,
             email="",  # Missing email
@@ -96,90 +163,62 @@ class TestAuthEndpointsEdgeCases:
     
     def test_auth_endpoints_missing_user_store_raises_error(self, api_key, jwt_service):
         """Test that AuthEndpoints requires a user store."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
         with pytest.raises(ValueError, match="User store must be provided"):
             AuthEndpoints(api_key=api_key, jwt_service=jwt_service, user_store=None)
     
-    def test_validate_email_edge_cases(self, api_key, jwt_service, mock_user_store):
+    @pytest.mark.parametrize("email,expected", [
+        ("user@example.com", True),
+        ("test+tag@domain.co.uk", True),
+        ("user.name@example-domain.com", True),
+        ("invalid-email", False),
+        ("@example.com", False),
+        ("user@", False),
+        ("user@domain", False),
+        ("", False),
+    ])
+    def test_validate_email_edge_cases(self, auth_endpoints, email, expected):
         """Test email validation with edge cases."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
-        
-        # Test valid emails
-        assert auth_endpoints._validate_email("user@example.com") is True
-        assert auth_endpoints._validate_email("test+tag@domain.co.uk") is True
-        assert auth_endpoints._validate_email("user.name@example-domain.com") is True
-        
-        # Test invalid emails  
-        assert auth_endpoints._validate_email("invalid-email") is False
-        assert auth_endpoints._validate_email("@example.com") is False
-        assert auth_endpoints._validate_email("user@") is False
-        assert auth_endpoints._validate_email("user@domain") is False
-        assert auth_endpoints._validate_email("") is False
+        assert auth_endpoints._validate_email(email) is expected
+    
+    def test_email_regex_is_compiled_once(self, auth_endpoints, auth_endpoints_factory):
+        """Test email pattern is precompiled and shared across instances."""
+        assert isinstance(getattr(auth_endpoints, "_email_re", None), re.Pattern)
+        other = auth_endpoints_factory(enable_rate_limiting=True)
+        assert other._email_re is auth_endpoints._email_re
     
-    def test_password_strength_validation(self, api_key, jwt_service, mock_user_store):
+    @pytest.mark.parametrize("password,expected", [
+        ("password123", True),
+        ("verylongpassword", True),
+        ("short", False),
+        ("1234567", False),  # 7 chars
+        ("", False),
+    ])
+    def test_password_strength_validation(self, auth_endpoints, password, expected):
         """Test password strength validation."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
-        
-        # Test valid passwords
-        assert auth_endpoints._validate_password_strength("password123") is True
-        assert auth_endpoints._validate_password_strength("verylongpassword") is True
-        
-        # Test invalid passwords
-        assert auth_endpoints._validate_password_strength("short") is False
-        assert auth_endpoints._validate_password_strength("1234567") is False  # 7 chars
-        assert auth_endpoints._validate_password_strength("") is False
+        assert auth_endpoints._validate_password_strength(password) is expected
     
-    def test_hash_and_verify_password(self, api_key, jwt_service, mock_user_store):
+    def test_hash_and_verify_password(self, auth_endpoints, bcrypt_sample):
         """Test password hashing and verification."""
-        from shared.auth.auth_endpoints import AuthEndpoints
+        password, hashed = bcrypt_sample
         
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
-        
-        password = "testpassword123"
-        hashed = auth_endpoints._hash_password(password)
-        
-        # Hash should be different from password
+        # Hash should be different from password and use the configured cost
         assert hashed != password
-        assert hashed.startswith("$2b$")
+        assert hashed.startswith(f"$2b${auth_endpoints.bcrypt_rounds:02d}$")
         
         # Verification should work
         assert auth_endpoints._verify_password(password, hashed) is True
         assert auth_endpoints._verify_password("wrongpassword", hashed) is False
     
-    def test_serialize_user_with_optional_fields(self, api_key, jwt_service, mock_user_store):
+    def test_serialize_user_with_optional_fields(self, auth_endpoints):
         """Test user serialization with optional fields."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
+        # Create user with minimal fields - no optional attributes at all
+        minimal_user = SimpleNamespace(
+            id="user_123",
+            email="user@example.com",
+            role="USER",
+            is_active=True
         )
         
-        # Create user with minimal fields - configure the mock to not have optional attributes
-        minimal_user = Mock(spec=['id', 'email', 'role', 'is_active'])
-        minimal_user.id = "user_123"
-        minimal_user.email = "user@example.com"
-        minimal_user.role = "USER"
-        minimal_user.is_active = True
-        
         serialized = auth_endpoints._serialize_user(minimal_user)
         
         assert serialized["id"] == "user_123"
@@ -193,72 +232,49 @@ class TestAuthEndpointsEdgeCases:
         assert serialized["last_login_at"] is None
         
         # Create user with all fields
-        full_user = Mock()
-        full_user.id = "user_456"
-        full_user.email = "full@example.com"
-        full_user.role = "ADMIN"
-        full_user.is_active = True
-        full_user.first_name = "John"
-        full_user.last_name = "Doe"
-        full_user.created_at = datetime.now(timezone.utc)
-        full_user.updated_at = datetime.now(timezone.utc)
-        full_user.last_login_at = datetime.now(timezone.utc)
+        now = datetime.now(timezone.utc)
+        full_user = SimpleNamespace(
+            id="user_456",
+            email="full@example.com",
+            role="ADMIN",
+            is_active=True,
+            first_name="John",
+            last_name="Doe",
+            created_at=now,
+            updated_at=now,
+            last_login_at=now
+        )
 
         serialized = auth_endpoints._serialize_user(full_user)
 
         assert serialized["first_name"] == "John"
         assert serialized["last_name"] == "Doe"
-        assert serialized["created_at"] is not None
-        assert serialized["updated_at"] is not None
-        assert serialized["last_login_at"] is not None
+        assert serialized["created_at"] == now.isoformat()
+        assert serialized["updated_at"] == now.isoformat()
+        assert serialized["last_login_at"] == now.isoformat()
     
     @pytest.mark.asyncio
     async def test_get_current_user_user_not_found(
-        self, api_key, jwt_service, mock_user_store
+        self, api_key, auth_endpoints, deleted_user_token, mock_user_store
     ):
         """Test get_current_user when user no longer exists."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
-        # Generate valid token
-        user_payload = {
-            "user_id": "deleted_user_123",
-            "email": "deleted@example.com",
-            "role": "USER",
-            "is_active": True
-        }
-        access_token = jwt_service.generate_access_token(user_payload)
-        
         # Mock user not found
         mock_user_store.get_user_by_id.return_value = None
         
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
-        
         result = await auth_endpoints.get_current_user(
             api_key=api_key,
-            access_token=access_token
+            access_token=deleted_user_token
         )
         
         assert result["success"] is False
         assert result["error"]["code"] == "USER_NOT_FOUND"
-        assert result["error"]["details"]["user_id"] == "deleted_user_123"
+        assert result["error"]["details"]["user_id"] == _DELETED_USER_PAYLOAD["user_id"]
     
     @pytest.mark.asyncio
     async def test_get_current_user_invalid_token(
-        self, api_key, jwt_service, mock_user_store
+        self, api_key, auth_endpoints
     ):
         """Test get_current_user with invalid token."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
-        
         result = await auth_endpoints.get_current_user(
             api_key=api_key,
             access_token="invalid.access.token"
@@ -268,18 +284,8 @@ class TestAuthEndpointsEdgeCases:
         assert result["error"]["code"] == "INVALID_ACCESS_TOKEN"
     
     @pytest.mark.asyncio
-    async def test_get_current_user_invalid_api_key(
-        self, jwt_service, mock_user_store
-    ):
+    async def test_get_current_user_invalid_api_key(self, auth_endpoints):
         """Test get_current_user with invalid API key."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
-        auth_endpoints = AuthEndpoints(
-            api_key="correct_key",
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-        )
-        
         result = await auth_endpoints.get_current_user(
             api_key="wrong_key",
             access_token="some.valid.token"
@@ -288,36 +294,26 @@ class TestAuthEndpointsEdgeCases:
         assert result["success"] is False
         assert result["error"]["code"] == "INVALID_API_KEY"
     
-    def test_rate_limiting_disabled_by_default(self, api_key, jwt_service, mock_user_store):
+    def test_rate_limiting_disabled_by_default(self, auth_endpoints):
         """Test that rate limiting is disabled by default."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store
-            # enable_rate_limiting not specified - should default to False
-        )
-        
-        # Rate limiting check should always return False
+        # auth_endpoints does not specify enable_rate_limiting, so the check
+        # should always return False
         assert auth_endpoints._check_rate_limit("any_key") is False
         assert auth_endpoints._check_rate_limit("another_key") is False
     
     @pytest.mark.asyncio
     async def test_register_rate_limiting(
-        self, api_key, jwt_service, mock_user_store
+        self, api_key, auth_endpoints_factory, mock_user_store
     ):
         """Test rate limiting for registration endpoint."""
-        from shared.auth.auth_endpoints import AuthEndpoints
-        
-        auth_endpoints = AuthEndpoints(
-            api_key=api_key,
-            jwt_service=jwt_service,
-            user_store=mock_user_store,
+        auth_endpoints = auth_endpoints_factory(
             enable_rate_limiting=True,
             max_attempts_per_minute=2
         )
         
+        # Email already taken, so processed attempts stop before creating a user
+        mock_user_store.get_user_by_email.return_value = SimpleNamespace(id="existing_user")
+        
         registration_data = {
             "email": "ratelimit@example.com",
             "password": "password123",
@@ -325,17 +321,20 @@ class TestAuthEndpointsEdgeCases:
             "last_name": "Limited"
         }
         
-        # First 2 attempts should be processed
-        for i in range(3):
-            result = await auth_endpoints.register(
-                api_key=api_key,
-                **registration_data
-            )
-            
-            if i < 2:
-                # Should be processed (may fail for other reasons)
-                assert result["error"]["code"] != "RATE_LIMIT_EXCEEDED"
-            else:
-                # 3rd attempt should be rate limited
-                assert result["error"]["code"] == "RATE_LIMIT_EXCEEDED"
-                assert "Too many registration attempts" in result["error"]["message"]
\ No newline at end of file
+        # Skip bcrypt and pin the clock so all attempts land in one rate-limit window
+        with patch.object(auth_endpoints, "_hash_password", return_value="$2b$fake"), \
+             patch("shared.auth.auth_endpoints.datetime", _FrozenDatetime):
+            # First 2 attempts should be processed
+            for i in range(3):
+                result = await auth_endpoints.register(
+                    api_key=api_key,
+                    **registration_data
+                )
+                
+                if i < 2:
+                    # Should be processed (may fail for other reasons)
+                    assert result["error"]["code"] != "RATE_LIMIT_EXCEEDED"
+                else:
+                    # 3rd attempt should be rate limited
+                    assert result["error"]["code"] == "RATE_LIMIT_EXCEEDED"
+                    assert "Too many registration attempts" in result["error"]["message"]
\ No newline at end of file
@@ -3,27 +3,65 @@ Test suite for Bucket model implementation following TDD principles.
 Based on API Contracts Plan specification for Bucket model.
 """
 
+import itertools
 import pytest
 import uuid
+from freezegun import freeze_time
 from datetime import datetime, timezone
+from types import SimpleNamespace
 
-from shared.models.bucket import Bucket
-from shared.models.user import User, UserRole
+
+# Fixed timestamp; no assertion depends on wall-clock time
+_NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _uid(n):
+    """Deterministic UUID from an integer; tests only need uniqueness, not randomness."""
+    return uuid.UUID(int=n)
+
+
+# Unbounded stream of distinct UUIDs, offset clear of explicit _uid(n) values
+_UUIDS = map(_uid, itertools.count(0x1000))
+
+
+@pytest.fixture(scope="module")
+def models():
+    """Model classes, imported on first use rather than at collection time."""
+    from shared.models.bucket import Bucket
+    from shared.models.user import User, UserRole
+    return SimpleNamespace(Bucket=Bucket, User=User, UserRole=UserRole)
+
+
+@pytest.fixture
+def make_bucket(models):
+    """Build a Bucket with test defaults; keyword arguments override fields."""
+    def _make(**overrides):
+        fields = dict(
+            id=next(_UUIDS),
+            name="test-bucket",
+            owner_id=next(_UUIDS),
+            public=False,
+            created_at=_NOW,
+            updated_at=_NOW
+        )
+        fields.update(overrides)
+        return models.Bucket(**fields)
+    return _make
 
 
 class TestBucketModel:
     """Test cases for Bucket model implementation."""
     
-    def test_bucket_creation_with_required_fields(self):
+    def test_bucket_creation_with_required_fields(self, models):
         """Test creating a bucket with all required fields."""
-        owner_id = uuid.uuid4()
-        bucket = Bucket(
-            id=uuid.uuid4(),
+        owner_id = next(_UUIDS)
+        bucket = models.Bucket(
+            id=next(_UUIDS),
             name="test-bucket",
             owner_id=owner_id,
             public=False,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
+            created_at=_NOW,
+            updated_at=_NOW
         )
         
         assert bucket.id is not None
@@ -34,155 +72,79 @@ class TestBucketModel:
         assert isinstance(bucket.created_at, datetime)
         assert isinstance(bucket.updated_at, datetime)
     
-    def test_bucket_public_access_flag(self):
+    def test_bucket_public_access_flag(self, make_bucket):
         """Test bucket public/private access flag."""
-        public_bucket = Bucket(
-            id=uuid.uuid4(),
-            name="public-assets",
-            owner_id=uuid.uuid4(),
-            public=True,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
-        )
+        public_bucket = make_bucket(name="public-assets", public=True)
         
-        private_bucket = Bucket(
-            id=uuid.uuid4(),
-            name="private-docs",
-            owner_id=uuid.uuid4(),
-            public=False,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
-        )
+        private_bucket = make_bucket(name="private-docs")
         
         assert public_bucket.public is True
         assert private_bucket.public is False
     
-    def test_bucket_name_validation(self):
+    @pytest.mark.parametrize("name", [
+        "simple-bucket",
+        "bucket123",
+        "my_bucket",
+        "bucket.with.dots",
+        "a"  # Single character
+    ])
+    def test_bucket_name_validation(self, make_bucket, name):
         """Test bucket name validation (URL-safe)."""
-        # Valid names
-        valid_names = [
-            "simple-bucket",
-            "bucket123",
-            "my_bucket",
-            "bucket.with.dots",
-            "a"  # Single character
-        ]
-        
-        for name in valid_names:
-            bucket = Bucket(
-                id=uuid.uuid4(),
-                name=name,
-                owner_id=uuid.uuid4(),
-                public=False,
-                created_at=datetime.now(timezone.utc),
-                updated_at=datetime.now(timezone.utc)
-            )
-            assert bucket.name == name
+        bucket = make_bucket(name=name)
+        assert bucket.name == name
     
-    def test_bucket_name_uniqueness_per_owner(self):
+    def test_bucket_name_uniqueness_per_owner(self, make_bucket):
         """Test that bucket names must be unique per owner."""
-        owner_id = uuid.uuid4()
-        bucket_name = "my-bucket"
-        
-        bucket1 = Bucket(
-            id=uuid.uuid4(),
-            name=bucket_name,
-            owner_id=owner_id,
-            public=False,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
-        )
-        
-        # Same owner, same name - should be prevented at database level
-        bucket2 = Bucket(
-            id=uuid.uuid4(),
-            name=bucket_name,
-            owner_id=owner_id,
-            public=True,  # Different public flag
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
+        # Same owner, same name (different public flag) - should be prevented at database level
+        bucket1, bucket2 = (
+            make_bucket(name="my-bucket", owner_id=_uid(1), public=public)
+            for public in (False, True)
         )
         
         assert bucket1.name == bucket2.name
         assert bucket1.owner_id == bucket2.owner_id
         # Database constraint should prevent this
     
-    def test_bucket_different_owners_can_have_same_name(self):
+    def test_bucket_different_owners_can_have_same_name(self, make_bucket):
         """Test that different owners can have buckets with same name."""
-        bucket_name = "shared-bucket-name"
-        
-        bucket1 = Bucket(
-            id=uuid.uuid4(),
-            name=bucket_name,
-            owner_id=uuid.uuid4(),
-            public=False,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
-        )
-        
-        bucket2 = Bucket(
-            id=uuid.uuid4(),
-            name=bucket_name,
-            owner_id=uuid.uuid4(),  # Different owner
-            public=False,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
+        bucket1, bucket2 = (
+            make_bucket(name="shared-bucket-name", owner_id=_uid(n))
+            for n in (1, 2)
         )
         
         assert bucket1.name == bucket2.name
         assert bucket1.owner_id != bucket2.owner_id
     
-    def test_bucket_ownership_relationship(self):
+    def test_bucket_ownership_relationship(self, models, make_bucket):
         """Test bucket ownership relationship to User."""
-        owner = User(
-            id=uuid.uuid4(),
+        owner = models.User(
+            id=next(_UUIDS),
             email="owner@example.com",
             password="ownerPassword123!",
-            role=UserRole.USER,
+            role=models.UserRole.USER,
             is_active=True,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
+            created_at=_NOW,
+            updated_at=_NOW
         )
         
-        bucket = Bucket(
-            id=uuid.uuid4(),
-            name="owner-bucket",
-            owner_id=owner.id,
-            public=False,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
-        )
+        bucket = make_bucket(name="owner-bucket", owner_id=owner.id)
         
         assert bucket.owner_id == owner.id
     
-    def test_bucket_timestamps(self):
+    def test_bucket_timestamps(self, make_bucket):
         """Test that created_at and updated_at are datetime objects."""
-        now = datetime.now(timezone.utc)
-        bucket = Bucket(
-            id=uuid.uuid4(),
-            name="timestamp-bucket",
-            owner_id=uuid.uuid4(),
-            public=False,
-            created_at=now,
-            updated_at=now
-        )
+        now = _NOW
+        bucket = make_bucket(name="timestamp-bucket", created_at=now, updated_at=now)
         
         assert bucket.created_at == now
         assert bucket.updated_at == now
         assert isinstance(bucket.created_at, datetime)
         assert isinstance(bucket.updated_at, datetime)
     
-    def test_bucket_to_dict_conversion(self):
+    def test_bucket_to_dict_conversion(self, make_bucket):
         """Test bucket serialization to dictionary."""
-        owner_id = uuid.uuid4()
-        bucket = Bucket(
-            id=uuid.uuid4(),
-            name="dict-bucket",
-            owner_id=owner_id,
-            public=True,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
-        )
+        owner_id = next(_UUIDS)
+        bucket = make_bucket(name="dict-bucket", owner_id=owner_id, public=True)
         
         bucket_dict = bucket.to_dict()
         
@@ -193,97 +155,54 @@ class TestBucketModel:
         assert "created_at" in bucket_dict
         assert "updated_at" in bucket_dict
     
-    def test_bucket_string_representation(self):
+    def test_bucket_string_representation(self, make_bucket):
         """Test bucket string representation."""
-        bucket = Bucket(
-            id=uuid.uuid4(),
-            name="repr-bucket",
-            owner_id=uuid.uuid4(),
-            public=False,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
-        )
+        bucket = make_bucket(name="repr-bucket")
         
         assert str(bucket) == f"<Bucket {bucket.name}>"
     
-    def test_bucket_repr(self):
+    def test_bucket_repr(self, make_bucket):
         """Test bucket detailed representation."""
-        bucket_id = uuid.uuid4()
-        owner_id = uuid.uuid4()
-        bucket = Bucket(
-            id=bucket_id,
-            name="test-bucket",
-            owner_id=owner_id,
-            public=True,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
-        )
+        bucket_id = _uid(1)
+        owner_id = _uid(2)
+        bucket = make_bucket(id=bucket_id, name="test-bucket", owner_id=owner_id, public=True)
         
         expected = f"<Bucket(id={bucket_id}, name=test-bucket, owner_id={owner_id}, public=True)>"
         assert repr(bucket) == expected
     
-    def test_bucket_minio_bucket_name_property(self):
+    def test_bucket_minio_bucket_name_property(self, make_bucket):
         """Test that bucket has minio_bucket_name property for internal use."""
-        bucket = Bucket(
-            id=uuid.uuid4(),
-            name="my-bucket",
-            owner_id=uuid.uuid4(),
-            public=False,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
-        )
+        bucket = make_bucket(name="my-bucket")
         
         # minio_bucket_name should be generated from id and name
         assert hasattr(bucket, 'minio_bucket_name')
         assert bucket.minio_bucket_name == f"{bucket.id}-{bucket.name}"
     
-    def test_bucket_description_field(self):
+    def test_bucket_description_field(self, make_bucket):
         """Test optional description field."""
         # Without description
-        bucket1 = Bucket(
-            id=uuid.uuid4(),
-            name="no-desc-bucket",
-            owner_id=uuid.uuid4(),
-            public=False,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
-        )
+        bucket1 = make_bucket(name="no-desc-bucket")
         assert bucket1.description is None
         
         # With description
-        bucket2 = Bucket(
-            id=uuid.uuid4(),
-            name="with-desc-bucket",
-            owner_id=uuid.uuid4(),
-            public=False,
-            description="This is my bucket description",
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
-        )
+        bucket2 = make_bucket(name="with-desc-bucket", description="This is my bucket description")
         assert bucket2.description == "This is my bucket description"
     
-    def test_bucket_metadata_field(self):
+    def test_bucket_metadata_field(self, make_bucket):
         """Test optional metadata field."""
         metadata = {"region": "us-east-1", "tier": "standard"}
         
-        bucket = Bucket(
-            id=uuid.uuid4(),
-            name="metadata-bucket",
-            owner_id=uuid.uuid4(),
-            public=False,
-            metadata=metadata,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
-        )
+        bucket = make_bucket(name="metadata-bucket", metadata=metadata)
         
         assert bucket.metadata == metadata
     
-    def test_bucket_creation_operations(self):
+    @freeze_time("2025-01-01T00:00:00Z")
+    def test_bucket_creation_operations(self, models):
         """Test bucket creation operations."""
-        owner_id = uuid.uuid4()
+        owner_id = next(_UUIDS)
         
         # Create bucket
-        bucket = Bucket.create(
+        bucket = models.Bucket.create(
             name="created-bucket",
             owner_id=owner_id,
             public=True,
@@ -295,5 +214,5 @@ class TestBucketModel:
         assert bucket.public is True
         assert bucket.description == "Test bucket creation"
         assert isinstance(bucket.id, uuid.UUID)
-        assert isinstance(bucket.created_at, datetime)
-        assert isinstance(bucket.updated_at, datetime)
\ No newline at end of file
+        assert bucket.created_at == _NOW
+        assert bucket.updated_at == _NOW
\ No newline at end of file
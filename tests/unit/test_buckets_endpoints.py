@@ -4,39 +4,51 @@ Tests business logic of create/get/delete buckets via backend router.
 Uses shared fixtures from tests/conftest.py (no hardcoded credentials).
 """
 
-import os
-from unittest.mock import AsyncMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 import pytest
 
+import endpoints.buckets as _bm
+
+
+# Storage service responses returned by the mocked storage client
+_RESP_CREATE = {
+    "success": True,
+    "bucket": {"name": "unit-bucket", "internal_bucket_name": "unit-bucket", "public": False},
+}
+_RESP_DELETE_OK = {"success": True}
+_RESP_DELETE_404 = {"detail": "Bucket not found"}
+
 
 @pytest.fixture
-def ensure_env(dev_environment):
+def ensure_env(dev_environment, monkeypatch):
     """Ensure environment variables from .env.dev are set for each test case."""
-    old = os.environ.copy()
-    os.environ.update(dev_environment)
-    # critical for auth middleware — no fallbacks, fail fast if missing
-    os.environ['API_KEY'] = dev_environment['API_KEY']
-    os.environ['JWT_SECRET_KEY'] = dev_environment['JWT_SECRET_KEY']
-    yield
-    os.environ.clear()
-    os.environ.update(old)
+    for key, value in dev_environment.items():
+        monkeypatch.setenv(key, value)
+
+
+@pytest.fixture
+def bucket_mocks(monkeypatch):
+    """Replace the storage client and database helpers of the buckets router."""
+    storage_client = MagicMock()
+    storage_client.make_request = AsyncMock()
+    db_manager = MagicMock()
+    monkeypatch.setattr(_bm, "storage_client", storage_client)
+    monkeypatch.setattr(_bm, "get_shared_connection_manager", lambda *args: db_manager)
+    monkeypatch.setattr(_bm, "_sync_bucket_to_db", AsyncMock(return_value=None))
+    monkeypatch.setattr(_bm, "_get_system_user_id", AsyncMock(return_value="test-user-id"))
+    monkeypatch.setattr(_bm, "_delete_bucket_from_db", AsyncMock(return_value=None))
+    return SimpleNamespace(storage_client=storage_client, db_manager=db_manager)
 
 
 class TestBucketEndpoints:
-    @patch("endpoints.buckets._sync_bucket_to_db", new_callable=AsyncMock)
-    @patch("endpoints.buckets._get_system_user_id", new_callable=AsyncMock)
-    @patch("endpoints.buckets.storage_client")
-    def test_create_bucket_success(self, mock_client, mock_get_user_id, mock_sync_bucket, ensure_env, api_client, test_api_key):
-        mock_client.make_request = AsyncMock(return_value={
-            "success": True,
-            "bucket": {"name": "unit-bucket", "internal_bucket_name": "unit-bucket", "public": False},
-        })
-        mock_get_user_id.return_value = "test-user-id"
-        mock_sync_bucket.return_value = None
-
-        client = api_client
-
-        resp = client.post(
+    @pytest.mark.asyncio
+    async def test_create_bucket_success(self, bucket_mocks, ensure_env, async_api_client, test_api_key):
+        bucket_mocks.storage_client.make_request.return_value = _RESP_CREATE
+
+        client = async_api_client
+
+        resp = await client.post(
             "/api/v1/buckets",
             json={"name": "unit-bucket", "owner_id": "test-user-id", "public": False},
             headers={"x-api-key": test_api_key},
@@ -46,54 +58,53 @@ class TestBucketEndpoints:
         assert data["success"] is True
         assert data["bucket"]["name"] == "unit-bucket"
 
-    @patch("endpoints.buckets._db_manager")
-    def test_get_bucket_not_found(self, mock_db_manager, ensure_env, api_client, test_api_key):
+    @pytest.mark.asyncio
+    async def test_get_bucket_not_found(self, bucket_mocks, ensure_env, async_api_client, test_api_key):
         # Mock database to return None (bucket not found)
         mock_conn = AsyncMock()
         mock_conn.fetchrow = AsyncMock(return_value=None)
-        mock_db_manager.acquire.return_value.__aenter__.return_value = mock_conn
+        bucket_mocks.db_manager.acquire.return_value.__aenter__.return_value = mock_conn
 
-        client = api_client
+        client = async_api_client
 
-        resp = client.get(
+        resp = await client.get(
             "/api/v1/buckets/missing-bucket",
             headers={"x-api-key": test_api_key},
         )
         assert resp.status_code == 404
         assert "not found" in resp.json()["detail"].lower()
 
-    @patch("endpoints.buckets._delete_bucket_from_db", new_callable=AsyncMock)
-    @patch("endpoints.buckets.storage_client")
-    def test_delete_bucket_success(self, mock_client, mock_delete_bucket, ensure_env, api_client, test_api_key):
-        mock_client.make_request = AsyncMock(return_value={"success": True})
-        mock_delete_bucket.return_value = None
+    @pytest.mark.asyncio
+    async def test_delete_bucket_success(self, bucket_mocks, ensure_env, async_api_client, test_api_key):
+        bucket_mocks.storage_client.make_request.return_value = _RESP_DELETE_OK
 
-        client = api_client
+        client = async_api_client
 
-        resp = client.delete(
+        resp = await client.delete(
             "/api/v1/buckets/empty-bucket",
             headers={"x-api-key": test_api_key},
         )
         assert resp.status_code == 200
         assert resp.json().get("success", True) is True
 
-    @patch("endpoints.buckets.storage_client")
-    def test_delete_bucket_not_found(self, mock_client, ensure_env, api_client, test_api_key):
-        mock_client.make_request = AsyncMock(return_value={"detail": "Bucket not found"})
+    @pytest.mark.asyncio
+    async def test_delete_bucket_not_found(self, bucket_mocks, ensure_env, async_api_client, test_api_key):
+        bucket_mocks.storage_client.make_request.return_value = _RESP_DELETE_404
 
-        client = api_client
+        client = async_api_client
 
-        resp = client.delete(
+        resp = await client.delete(
             "/api/v1/buckets/does-not-exist",
             headers={"x-api-key": test_api_key},
         )
         assert resp.status_code == 404
         assert "not found" in resp.json()["detail"].lower()
 
-    def test_create_bucket_unauthorized(self, api_client):
-        client = api_client
+    @pytest.mark.asyncio
+    async def test_create_bucket_unauthorized(self, async_api_client):
+        client = async_api_client
 
-        resp = client.post(
+        resp = await client.post(
             "/api/v1/buckets",
             json={"name": "unauth-bucket"},
             headers={},
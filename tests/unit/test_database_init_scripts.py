@@ -4,64 +4,169 @@ RED Phase: Write failing tests first for database initialization system
 """
 import pytest
 import asyncio
+import functools
+import mmap
 import os
+import re
+import stat
 import tempfile
 import shutil
 from pathlib import Path
 
+import yaml
+
+# Repository paths inspected by these tests, relative to the project root
+_INIT_DIR = "database/init"
+_MIGRATIONS_DIR = "database/migrations"
+_TABLES_SQL = "database/init/01_create_tables.sql"
+_INDEXES_SQL = "database/init/02_create_indexes.sql"
+_MIGRATION_MANAGER = "shared/database/migration_manager.py"
+_MIGRATE_CLI = "scripts/migrate.py"
+_DOCKER_COMPOSE = "docker-compose.template.yml"
+
+
+def _scanner(needles):
+    """Compile needles into one alternation so a file is scanned in a single pass."""
+    # Longest first, so a needle that extends another wins where both start
+    ordered = sorted(needles, key=len, reverse=True)
+    separator = b"|" if isinstance(ordered[0], bytes) else "|"
+    return re.compile(separator.join(map(re.escape, ordered)))
+
+
+# Matched against the raw bytes of the mapped table script
+_TABLE_NEEDLES = {
+    f"CREATE TABLE IF NOT EXISTS {table}".encode(): table
+    for table in [
+        "users", "buckets", "files", "functions", "tables",
+        "webhooks", "function_executions", "webhook_deliveries", "function_logs",
+        "migrations", "data_records", "system_states", "active_executions",
+        "resource_pool_states", "audit_logs", "performance_metrics",
+        "system_checkpoints"
+    ]
+}
+_TABLE_SCANNER = _scanner(_TABLE_NEEDLES)
+
+_INDEX_NEEDLES = {
+    f"CREATE INDEX IF NOT EXISTS {index}": index
+    for index in [
+        "idx_buckets_owner_id", "idx_files_bucket_id", "idx_files_owner_id",
+        "idx_functions_owner_id", "idx_users_email", "idx_users_role"
+    ]
+}
+_INDEX_SCANNER = _scanner(_INDEX_NEEDLES)
+
+_METHOD_NEEDLES = {
+    f"async def {method}" if method_type == "async" else f"def {method}": method
+    for method, method_type in [
+        ("initialize_migrations_table", "async"),
+        ("get_applied_migrations", "async"),
+        ("get_available_migrations", "def"),
+        ("apply_migration", "async"),
+        ("run_pending_migrations", "async"),
+        ("rollback_migration", "async"),
+        ("get_migration_status", "async")
+    ]
+}
+_METHOD_SCANNER = _scanner(_METHOD_NEEDLES)
+
+
+def _missing(needles, scanner, content):
+    """Names whose needle does not occur anywhere in content."""
+    found = set(scanner.findall(content))
+    return [name for needle, name in needles.items() if needle not in found]
+
+
+@functools.lru_cache(maxsize=None)
+def _dir_set(directory):
+    """Names in a directory, listed with one scandir call and cached."""
+    try:
+        with os.scandir(directory) as entries:
+            return frozenset(entry.name for entry in entries)
+    except FileNotFoundError:
+        return frozenset()
+
+
+def _exists(path):
+    """Whether path exists, answered from its parent directory's listing."""
+    path = Path(path)
+    return path.name in _dir_set(str(path.parent))
+
+
+@functools.lru_cache(maxsize=256)
+def _stat(path):
+    """Cached os.stat result for path, or None if it does not exist."""
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+def _executable(path):
+    """Whether path is a regular file with an execute bit set."""
+    st = _stat(path)
+    return st is not None and stat.S_ISREG(st.st_mode) and bool(st.st_mode & 0o111)
+
+
+@pytest.fixture(scope="session")
+def file_contents():
+    """Decoded text of every file these tests inspect, read once per session."""
+    paths = [
+        _INDEXES_SQL,
+        _MIGRATION_MANAGER,
+        _MIGRATE_CLI,
+    ]
+    return {path: Path(path).read_text() for path in paths}
+
+
+@pytest.fixture(scope="session")
+def docker_compose_text():
+    """Raw docker-compose template, read once per session."""
+    return Path(_DOCKER_COMPOSE).read_text()
+
+
+@pytest.fixture(scope="session")
+def docker_compose_yaml(docker_compose_text):
+    """Docker-compose template parsed once per session."""
+    return yaml.safe_load(docker_compose_text)
+
+
+@pytest.fixture(scope="session")
+def table_script():
+    """Read-only memory map of the table init script, scanned without decoding."""
+    with open(_TABLES_SQL, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
+
 
 class TestDatabaseInitScripts:
     """Test database initialization scripts following TDD methodology."""
 
     def test_init_script_files_exist(self):
         """Test that init script files exist."""
-        init_dir = Path("database/init")
-        assert init_dir.exists(), "Database init directory should exist"
-
-        tables_file = init_dir / "01_create_tables.sql"
-        indexes_file = init_dir / "02_create_indexes.sql"
+        assert _exists(_INIT_DIR), "Database init directory should exist"
 
-        assert tables_file.exists(), "Tables init script should exist"
-        assert indexes_file.exists(), "Indexes init script should exist"
+        assert _exists(_TABLES_SQL), "Tables init script should exist"
+        assert _exists(_INDEXES_SQL), "Indexes init script should exist"
 
-    def test_init_script_has_all_tables(self):
+    def test_init_script_has_all_tables(self, table_script):
         """Test that init script creates all 17 required tables."""
-        tables_file = Path("database/init/01_create_tables.sql")
-        content = tables_file.read_text()
-
         # Check for all required tables
-        required_tables = [
-            "users", "buckets", "files", "functions", "tables",
-            "webhooks", "function_executions", "webhook_deliveries", "function_logs",
-            "migrations", "data_records", "system_states", "active_executions",
-            "resource_pool_states", "audit_logs", "performance_metrics",
-            "system_checkpoints"
-        ]
-
-        for table in required_tables:
-            assert f"CREATE TABLE IF NOT EXISTS {table}" in content, f"Table {table} should be created"
+        missing = _missing(_TABLE_NEEDLES, _TABLE_SCANNER, table_script)
+        assert not missing, f"Tables {missing} should be created"
 
-    def test_init_script_creates_indexes(self):
+    def test_init_script_creates_indexes(self, file_contents):
         """Test that init script creates all required indexes."""
-        indexes_file = Path("database/init/02_create_indexes.sql")
-        content = indexes_file.read_text()
+        content = file_contents[_INDEXES_SQL]
 
         # Check for key indexes
-        required_indexes = [
-            "idx_buckets_owner_id", "idx_files_bucket_id", "idx_files_owner_id",
-            "idx_functions_owner_id", "idx_users_email", "idx_users_role"
-        ]
-
-        for index in required_indexes:
-            assert f"CREATE INDEX IF NOT EXISTS {index}" in content, f"Index {index} should be created"
+        missing = _missing(_INDEX_NEEDLES, _INDEX_SCANNER, content)
+        assert not missing, f"Indexes {missing} should be created"
 
-    def test_init_script_is_idempotent(self):
+    def test_init_script_is_idempotent(self, table_script):
         """Test that init script can be run multiple times safely."""
-        tables_file = Path("database/init/01_create_tables.sql")
-        content = tables_file.read_text()
-
         # All table creations should use IF NOT EXISTS
-        assert "CREATE TABLE IF NOT EXISTS" in content, "Tables should be created with IF NOT EXISTS"
+        assert table_script.find(b"CREATE TABLE IF NOT EXISTS") != -1, \
+               "Tables should be created with IF NOT EXISTS"
 
     # Admin user creation is now handled by the backend application, not SQL scripts
     # This test has been removed as the SQL script is no longer needed
@@ -74,71 +179,52 @@ class TestDatabaseInitScripts:
 class TestMigrationSystem:
     """Test migration system following TDD methodology."""
 
-    def test_migration_manager_exists(self):
+    def test_migration_manager_exists(self, file_contents):
         """Test that migration manager exists."""
-        migration_file = Path("shared/database/migration_manager.py")
-        assert migration_file.exists(), "Migration manager file should exist"
+        assert _exists(_MIGRATION_MANAGER), "Migration manager file should exist"
 
-        content = migration_file.read_text()
+        content = file_contents[_MIGRATION_MANAGER]
         assert "MigrationManager" in content, "MigrationManager class should be defined"
         assert "async def run_pending_migrations" in content, "Should have run_pending_migrations method"
         assert "async def rollback_migration" in content, "Should have rollback_migration method"
 
     def test_migration_files_exist(self):
         """Test that migration files exist."""
-        migrations_dir = Path("database/migrations")
-        assert migrations_dir.exists(), "Migrations directory should exist"
+        assert _exists(_MIGRATIONS_DIR), "Migrations directory should exist"
 
-        migration_files = list(migrations_dir.glob("*.sql"))
-        assert len(migration_files) >= 4, "Should have at least 4 migration files"
+        sql_names = {name for name in _dir_set(_MIGRATIONS_DIR) if name.endswith(".sql")}
+        assert len(sql_names) >= 4, "Should have at least 4 migration files"
 
         # Check for specific migration files
-        expected_migrations = [
+        expected_migrations = {
             "001_initial_schema.sql",
             "002_audit_tables.sql",
             "003_system_tables.sql",
             "004_create_indexes.sql"
-        ]
+        }
 
-        for migration in expected_migrations:
-            migration_file = migrations_dir / migration
-            assert migration_file.exists(), f"Migration file {migration} should exist"
+        missing = sorted(expected_migrations - sql_names)
+        assert not missing, f"Migration files {missing} should exist"
 
-    def test_migration_manager_has_proper_methods(self):
+    def test_migration_manager_has_proper_methods(self, file_contents):
         """Test that migration manager has proper methods."""
-        migration_file = Path("shared/database/migration_manager.py")
-        content = migration_file.read_text()
-
-        required_methods = [
-            ("initialize_migrations_table", "async"),
-            ("get_applied_migrations", "async"),
-            ("get_available_migrations", "def"),
-            ("apply_migration", "async"),
-            ("run_pending_migrations", "async"),
-            ("rollback_migration", "async"),
-            ("get_migration_status", "async")
-        ]
+        content = file_contents[_MIGRATION_MANAGER]
 
-        for method, method_type in required_methods:
-            if method_type == "async":
-                assert f"async def {method}" in content, f"Method {method} should be async"
-            else:
-                assert f"def {method}" in content, f"Method {method} should be defined"
+        missing = _missing(_METHOD_NEEDLES, _METHOD_SCANNER, content)
+        assert not missing, f"Methods {missing} should be defined (async where required)"
 
-    def test_migration_cli_exists(self):
+    def test_migration_cli_exists(self, file_contents):
         """Test that migration CLI tool exists."""
-        cli_file = Path("scripts/migrate.py")
-        assert cli_file.exists(), "Migration CLI file should exist"
-        assert os.access(cli_file, os.X_OK), "Migration CLI should be executable"
+        assert _stat(_MIGRATE_CLI) is not None, "Migration CLI file should exist"
+        assert _executable(_MIGRATE_CLI), "Migration CLI should be executable"
 
-        content = cli_file.read_text()
+        content = file_contents[_MIGRATE_CLI]
         assert "MigrationManager" in content, "CLI should use MigrationManager"
         assert "argparse" in content, "CLI should use argparse for command line parsing"
 
-    def test_migration_system_has_error_handling(self):
+    def test_migration_system_has_error_handling(self, file_contents):
         """Test that migration system has proper error handling."""
-        migration_file = Path("shared/database/migration_manager.py")
-        content = migration_file.read_text()
+        content = file_contents[_MIGRATION_MANAGER]
 
         assert "try:" in content, "Migration system should have try-catch blocks"
         assert "except" in content, "Migration system should have exception handling"
@@ -146,23 +232,23 @@ class TestMigrationSystem:
 
 
 @pytest.mark.integration
+@pytest.mark.xdist_group("fs_readonly")
 class TestDatabaseInitIntegration:
     """Integration tests for database initialization system."""
 
-    def test_docker_config_has_init_scripts_mounted(self):
+    def test_docker_config_has_init_scripts_mounted(self, docker_compose_text, docker_compose_yaml):
         """Test that Docker configuration mounts init scripts."""
-        docker_file = Path("docker-compose.template.yml")
-        content = docker_file.read_text()
+        content = docker_compose_text
+        volumes = docker_compose_yaml["services"]["postgres"]["volumes"]
 
-        assert "./database/init:/docker-entrypoint-initdb.d" in content, \
+        assert "./database/init:/docker-entrypoint-initdb.d" in volumes, \
                "Docker config should mount init scripts"
         assert "ADMIN_EMAIL" in content, "Docker config should have admin email env var"
         assert "ADMIN_PASSWORD" in content, "Docker config should have admin password env var"
 
-    def test_docker_config_has_environment_variable_support(self):
+    def test_docker_config_has_environment_variable_support(self, docker_compose_text):
         """Test that Docker configuration supports environment variables for admin creation."""
-        docker_file = Path("docker-compose.template.yml")
-        content = docker_file.read_text()
+        content = docker_compose_text
 
         assert "ADMIN_EMAIL" in content, "Docker config should support ADMIN_EMAIL environment variable"
         assert "ADMIN_PASSWORD" in content, "Docker config should support ADMIN_PASSWORD environment variable"
@@ -171,31 +257,28 @@ class TestDatabaseInitIntegration:
 
     def test_migration_script_is_executable(self):
         """Test that migration CLI script is executable."""
-        cli_file = Path("scripts/migrate.py")
-        assert cli_file.exists(), "Migration CLI file should exist"
-        assert os.access(cli_file, os.X_OK), "Migration CLI should be executable"
+        assert _stat(_MIGRATE_CLI) is not None, "Migration CLI file should exist"
+        assert _executable(_MIGRATE_CLI), "Migration CLI should be executable"
 
     def test_all_required_files_exist(self):
         """Test that all required files for database initialization exist."""
         required_files = [
-            "database/init/01_create_tables.sql",
-            "database/init/02_create_indexes.sql",
+            _TABLES_SQL,
+            _INDEXES_SQL,
             "database/migrations/001_initial_schema.sql",
             "database/migrations/002_audit_tables.sql",
             "database/migrations/003_system_tables.sql",
             "database/migrations/004_create_indexes.sql",
-            "shared/database/migration_manager.py",
-            "scripts/migrate.py"
+            _MIGRATION_MANAGER,
+            _MIGRATE_CLI
         ]
 
         for file_path in required_files:
-            file_obj = Path(file_path)
-            assert file_obj.exists(), f"Required file {file_path} should exist"
+            assert _exists(file_path), f"Required file {file_path} should exist"
 
-    def test_docker_config_has_proper_environment_vars(self):
+    def test_docker_config_has_proper_environment_vars(self, docker_compose_text):
         """Test that Docker configuration has proper environment variables."""
-        docker_file = Path("docker-compose.template.yml")
-        content = docker_file.read_text()
+        content = docker_compose_text
 
         required_env_vars = [
             "ADMIN_FIRST_NAME", "ADMIN_LAST_NAME", "DATABASE_URL"
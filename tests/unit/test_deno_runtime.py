@@ -10,7 +10,15 @@ import pytest
 from datetime import datetime, timezone
 
 
-def test_deno_runtime_initialization():
+@pytest.fixture(scope="session")
+def deno_runtime():
+    """One default-configured DenoRuntime shared across the session."""
+    from shared.runtime.deno_runtime import DenoRuntime
+
+    return DenoRuntime()
+
+
+def test_deno_runtime_initialization(deno_runtime):
     """
     Test DenoRuntime can be initialized and configured.
     
@@ -18,11 +26,7 @@ def test_deno_runtime_initialization():
     GREEN Phase: Implement DenoRuntime class to make this pass.
     REFACTOR Phase: Clean up runtime code if needed.
     """
-    # Import will fail - runtime doesn't exist yet
-    from shared.runtime.deno_runtime import DenoRuntime
-    
-    # Initialize Deno runtime
-    runtime = DenoRuntime()
+    runtime = deno_runtime
     
     # Verify runtime properties
     assert runtime.name == "deno"
@@ -32,7 +36,7 @@ def test_deno_runtime_initialization():
     assert runtime.supports_javascript() is True
 
 
-def test_deno_runtime_code_execution():
+def test_deno_runtime_code_execution(deno_runtime):
     """
     Test DenoRuntime can execute TypeScript/JavaScript code.
     
@@ -40,10 +44,7 @@ def test_deno_runtime_code_execution():
     GREEN Phase: Add execute() method to DenoRuntime.
     REFACTOR Phase: Optimize execution if needed.
     """
-    from shared.runtime.deno_runtime import DenoRuntime
-    
-    # Initialize runtime
-    runtime = DenoRuntime()
+    runtime = deno_runtime
     
     # Simple JavaScript code
     js_code = '''
@@ -64,16 +65,13 @@ def test_deno_runtime_code_execution():
     assert result.execution_time_ms > 0
 
 
-def test_deno_runtime_typescript_execution():
+def test_deno_runtime_typescript_execution(deno_runtime):
     """
     Test DenoRuntime can execute TypeScript code with type checking.
     
     This verifies TypeScript compilation and execution.
     """
-    from shared.runtime.deno_runtime import DenoRuntime
-    
-    # Initialize runtime
-    runtime = DenoRuntime()
+    runtime = deno_runtime
     
     # TypeScript code with interfaces
     ts_code = '''
@@ -103,16 +101,13 @@ def test_deno_runtime_typescript_execution():
     assert result.return_value["processed"] is True
 
 
-def test_deno_runtime_error_handling():
+def test_deno_runtime_error_handling(deno_runtime):
     """
     Test DenoRuntime properly handles code execution errors.
     
     This verifies error capture and reporting.
     """
-    from shared.runtime.deno_runtime import DenoRuntime
-    
-    # Initialize runtime
-    runtime = DenoRuntime()
+    runtime = deno_runtime
     
     # Code with syntax error
     bad_code = '''
@@ -140,8 +135,9 @@ def test_deno_runtime_timeout_handling():
     """
     from shared.runtime.deno_runtime import DenoRuntime
     
-    # Initialize runtime with short timeout
-    runtime = DenoRuntime(timeout_ms=100)
+    # Initialize runtime with short timeout; the fake clock jumps past it
+    ticks = iter([0.0, 0.101])
+    runtime = DenoRuntime(timeout_ms=100, clock=lambda: next(ticks))
     
     # Code that runs longer than timeout
     timeout_code = '''
@@ -157,19 +153,16 @@ def test_deno_runtime_timeout_handling():
     assert result.success is False
     assert result.error_message is not None
     assert "timeout" in result.error_message.lower()
-    assert result.execution_time_ms >= 100  # Should be at least the timeout duration
+    assert result.execution_time_ms >= runtime.timeout_ms  # Should be at least the timeout duration
 
 
-def test_deno_runtime_memory_isolation():
+def test_deno_runtime_memory_isolation(deno_runtime):
     """
     Test DenoRuntime isolates execution contexts between runs.
     
     This ensures functions don't interfere with each other.
     """
-    from shared.runtime.deno_runtime import DenoRuntime
-    
-    # Initialize runtime
-    runtime = DenoRuntime()
+    runtime = deno_runtime
     
     # First execution sets a variable
     first_code = '''
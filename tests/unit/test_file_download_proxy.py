@@ -182,6 +182,123 @@ class TestFileDownloadProxy:
             assert "Range" in call_args[1]["headers"]
             assert call_args[1]["headers"]["Range"] == "bytes=100-119"
     
+    @pytest.mark.asyncio
+    async def test_file_download_proxy_parallel_range_download(self, file_download_proxy):
+        """Test a file is fetched as concurrent ranges and reassembled in order."""
+        file_content = bytes(range(256)) * 4  # 1024 bytes
+        
+        async def storage(method, url, headers):
+            response = Mock()
+            if method == "HEAD":
+                response.status_code = 200
+                response.headers = {
+                    "Content-Type": "application/octet-stream",
+                    "Content-Length": str(len(file_content)),
+                    "Accept-Ranges": "bytes",
+                    "ETag": "\"v1\""
+                }
+                response.content = b""
+            else:
+                assert headers["If-Range"] == "\"v1\""
+                start, end = map(int, headers["Range"].removeprefix("bytes=").split("-"))
+                response.status_code = 206
+                response.headers = {"Content-Range": f"bytes {start}-{end}/{len(file_content)}"}
+                response.content = file_content[start:end + 1]
+            return response
+        
+        with patch.object(file_download_proxy._http_client, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = storage
+            
+            result = await file_download_proxy.download_file_parallel(
+                bucket="test-bucket",
+                path="large-file.bin",
+                auth_headers={"Authorization": "Bearer test-token"},
+                num_parts=4
+            )
+            
+            assert result["status"] == "success"
+            assert result["content"] == file_content
+            assert result["size"] == len(file_content)
+            assert result["parts"] == 4
+            
+            # One HEAD plus one GET per range, each carrying the auth header
+            ranges = [call[1]["headers"].get("Range") for call in mock_request.call_args_list[1:]]
+            assert ranges == ["bytes=0-255", "bytes=256-511", "bytes=512-767", "bytes=768-1023"]
+            assert all(call[1]["headers"]["Authorization"] == "Bearer test-token"
+                       for call in mock_request.call_args_list)
+    
+    @pytest.mark.asyncio
+    async def test_file_download_proxy_parallel_refetches_changed_file(self, file_download_proxy):
+        """Test a file replaced mid-download is fetched whole rather than spliced."""
+        new_content = b"replaced and grown since the HEAD request"
+        
+        async def storage(method, url, headers):
+            response = Mock()
+            if method == "HEAD":
+                response.status_code = 200
+                response.headers = {"Content-Length": "32", "Accept-Ranges": "bytes", "ETag": "\"v1\""}
+                response.content = b""
+            elif headers.get("Range") == "bytes=0-15":
+                response.status_code = 206
+                response.headers = {"Content-Range": "bytes 0-15/32"}
+                response.content = b"x" * 16
+            else:
+                # If-Range no longer matches, so the server sends the new file
+                response.status_code = 200
+                response.headers = {"Content-Type": "text/plain"}
+                response.content = new_content
+            return response
+        
+        # A stale cached HEAD must not be trusted for the size
+        file_download_proxy._cache_metadata(
+            file_download_proxy._metadata_key(
+                "test-bucket", "grown.txt",
+                file_download_proxy._sanitize_headers({"Authorization": "Bearer test-token"})),
+            {"status": "found", "size": 16, "accept_ranges": "bytes", "etag": "\"v0\""}
+        )
+        
+        with patch.object(file_download_proxy._http_client, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = storage
+            
+            result = await file_download_proxy.download_file_parallel(
+                bucket="test-bucket",
+                path="grown.txt",
+                auth_headers={"Authorization": "Bearer test-token"},
+                num_parts=2
+            )
+            
+            assert result["status"] == "success"
+            assert result["content"] == new_content
+            assert mock_request.call_args_list[0][1]["method"] == "HEAD"
+            assert "Range" not in mock_request.call_args[1]["headers"]
+    
+    @pytest.mark.asyncio
+    async def test_file_download_proxy_parallel_falls_back_without_ranges(self, file_download_proxy):
+        """Test parallel download uses a single GET when ranges are not supported."""
+        head_response = Mock()
+        head_response.status_code = 200
+        head_response.headers = {"Content-Type": "text/plain", "Content-Length": "24"}
+        head_response.content = b""
+        
+        get_response = Mock()
+        get_response.status_code = 200
+        get_response.headers = {"Content-Type": "text/plain"}
+        get_response.content = b"no ranges for this file."
+        
+        with patch.object(file_download_proxy._http_client, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = [head_response, get_response]
+            
+            result = await file_download_proxy.download_file_parallel(
+                bucket="test-bucket",
+                path="small.txt",
+                auth_headers={"Authorization": "Bearer test-token"}
+            )
+            
+            assert result["status"] == "success"
+            assert result["content"] == b"no ranges for this file."
+            assert mock_request.call_count == 2
+            assert "Range" not in mock_request.call_args[1]["headers"]
+    
     @pytest.mark.asyncio
     async def test_file_download_proxy_head_request(self, file_download_proxy):
         """Test file metadata retrieval using HEAD request."""
@@ -218,6 +335,42 @@ class TestFileDownloadProxy:
             call_args = mock_request.call_args
             assert call_args[1]["method"] == "HEAD"
     
+    @pytest.mark.asyncio
+    async def test_file_download_proxy_metadata_cache(self, file_download_proxy):
+        """Test HEAD results are reused per caller and short-circuit conditional GETs."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {"Content-Length": "10", "ETag": "\"v1\""}
+        mock_response.content = b""
+        auth_headers = {"Authorization": "Bearer test-token"}
+        
+        with patch.object(file_download_proxy._http_client, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = mock_response
+            
+            first = await file_download_proxy.get_file_metadata("test-bucket", "cached.txt", auth_headers)
+            second = await file_download_proxy.get_file_metadata("test-bucket", "cached.txt", auth_headers)
+            assert first == second
+            assert mock_request.call_count == 1
+            
+            # A matching ETag is answered without contacting storage
+            result = await file_download_proxy.download_file_conditional(
+                "test-bucket", "cached.txt", auth_headers, if_none_match="\"v1\""
+            )
+            assert result == {"status": "not_modified", "etag": "\"v1\""}
+            assert mock_request.call_count == 1
+            
+            # Other callers do not share the entry
+            await file_download_proxy.get_file_metadata(
+                "test-bucket", "cached.txt", {"Authorization": "Bearer other-token"}
+            )
+            assert mock_request.call_count == 2
+            
+            # Expired entries are refetched
+            file_download_proxy._meta_cache_ttl = 0.0
+            await file_download_proxy.get_file_metadata("test-bucket", "other.txt", auth_headers)
+            await file_download_proxy.get_file_metadata("test-bucket", "other.txt", auth_headers)
+            assert mock_request.call_count == 4
+    
     @pytest.mark.asyncio
     async def test_file_download_proxy_progress_tracking(self, file_download_proxy):
         """Test download progress tracking."""
@@ -277,6 +430,112 @@ class TestFileDownloadProxy:
             assert progress_updates[-1]["percentage"] == 100.0
             assert progress_updates[-1]["downloaded"] == total_size
     
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("interval,expected_updates", [(0.0, 11), (3600.0, 1)])
+    async def test_file_download_proxy_progress_throttling(self, file_download_proxy, interval, expected_updates):
+        """Test progress callbacks are limited by the progress interval."""
+        file_chunks = [b"x" * 1024 for _ in range(10)]
+        progress_updates = []
+        
+        async def aiter_chunks(*args, **kwargs):
+            for chunk in file_chunks:
+                yield chunk
+        
+        mock_response = AsyncMock()
+        mock_response.status_code = 200
+        mock_response.headers = {"Content-Length": str(sum(map(len, file_chunks)))}
+        mock_response.aiter_bytes = aiter_chunks
+        
+        mock_context_manager = AsyncMock()
+        mock_context_manager.__aenter__.return_value = mock_response
+        mock_context_manager.__aexit__.return_value = None
+        
+        file_download_proxy._progress_interval = interval
+        with patch.object(file_download_proxy._http_client, 'stream', return_value=mock_context_manager):
+            result = await file_download_proxy.download_file_with_progress(
+                bucket="test-bucket",
+                path="progress-test.bin",
+                auth_headers={"Authorization": "Bearer test-token"},
+                progress_callback=lambda done, total: progress_updates.append(done)
+            )
+        
+        assert result["content"] == b"".join(file_chunks)
+        # Every chunk plus the final update, or only the final update
+        assert len(progress_updates) == expected_updates
+        assert progress_updates[-1] == 10 * 1024
+    
+    @pytest.mark.asyncio
+    async def test_file_download_proxy_download_to_path(self, file_download_proxy, tmp_path):
+        """Test downloading straight to a file on disk."""
+        file_chunks = [bytes([i]) * 4096 for i in range(8)]
+        total_size = sum(len(chunk) for chunk in file_chunks)
+        progress_updates = []
+        
+        async def aiter_chunks(*args, **kwargs):
+            for chunk in file_chunks:
+                yield chunk
+        
+        mock_response = AsyncMock()
+        mock_response.status_code = 200
+        mock_response.headers = {"Content-Length": str(total_size), "Content-Type": "application/octet-stream"}
+        mock_response.aiter_bytes = aiter_chunks
+        
+        mock_context_manager = AsyncMock()
+        mock_context_manager.__aenter__.return_value = mock_response
+        mock_context_manager.__aexit__.return_value = None
+        
+        dest = tmp_path / "download.bin"
+        with patch.object(file_download_proxy._http_client, 'stream', return_value=mock_context_manager):
+            result = await file_download_proxy.download_file_to_path(
+                bucket="test-bucket",
+                path="large-file.bin",
+                dest_path=str(dest),
+                auth_headers={"Authorization": "Bearer test-token"},
+                progress_callback=lambda done, total: progress_updates.append(done)
+            )
+        
+        assert result["status"] == "success"
+        assert result["size"] == total_size
+        assert dest.stat().st_size == total_size
+        assert dest.read_bytes() == b"".join(file_chunks)
+        assert progress_updates[-1] == total_size
+    
+    @pytest.mark.parametrize("failure", [OSError("connection reset"), asyncio.CancelledError()])
+    @pytest.mark.asyncio
+    async def test_file_download_proxy_download_to_path_keeps_existing_file(self, file_download_proxy,
+                                                                            tmp_path, failure):
+        """Test a failed or cancelled download leaves the destination untouched."""
+        async def aiter_chunks(*args, **kwargs):
+            yield b"partial"
+            raise failure
+        
+        mock_response = AsyncMock()
+        mock_response.status_code = 200
+        mock_response.headers = {"Content-Length": "1024"}
+        mock_response.aiter_bytes = aiter_chunks
+        
+        mock_context_manager = AsyncMock()
+        mock_context_manager.__aenter__.return_value = mock_response
+        mock_context_manager.__aexit__.return_value = None
+        
+        dest = tmp_path / "download.bin"
+        dest.write_bytes(b"previous version")
+        with patch.object(file_download_proxy._http_client, 'stream', return_value=mock_context_manager):
+            try:
+                result = await file_download_proxy.download_file_to_path(
+                    bucket="test-bucket",
+                    path="large-file.bin",
+                    dest_path=str(dest),
+                    auth_headers={"Authorization": "Bearer test-token"}
+                )
+            except asyncio.CancelledError:
+                assert isinstance(failure, asyncio.CancelledError)
+            else:
+                assert result["status"] == "error"
+        
+        assert dest.read_bytes() == b"previous version"
+        assert list(tmp_path.iterdir()) == [dest]
+    
     @pytest.mark.asyncio
     async def test_file_download_proxy_error_handling(self, file_download_proxy):
         """Test various error conditions during download."""
@@ -360,6 +619,30 @@ class TestFileDownloadProxy:
             assert "X-User-ID" in forwarded_headers
             assert forwarded_headers["Authorization"] == "Bearer jwt-token-123"
     
+    @pytest.mark.asyncio
+    async def test_file_download_proxy_drops_unlisted_headers(self, file_download_proxy):
+        """Test that only allow-listed headers reach the storage service."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = b"file content"
+        mock_response.headers = {"Content-Type": "text/plain"}
+        
+        with patch.object(file_download_proxy._http_client, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = mock_response
+            
+            await file_download_proxy.download_file(
+                bucket="test-bucket",
+                path="file.txt",
+                auth_headers={
+                    "x-api-key": "api-key-456",
+                    "Host": "evil.example.com",
+                    "Connection": "close",
+                    "Cookie": "session=abc"
+                }
+            )
+            
+            assert mock_request.call_args[1]["headers"] == {"x-api-key": "api-key-456"}
+    
     @pytest.mark.asyncio
     async def test_file_download_proxy_caching_headers(self, file_download_proxy):
         """Test handling of caching and conditional request headers."""
@@ -395,23 +678,57 @@ class TestFileDownloadProxy:
         # Verify configuration settings
         assert config["download_timeout"] > 0
         assert config["max_concurrent_downloads"] > 0
-        assert config["buffer_size"] > 0
+        assert config["buffer_size"] >= 65536
         assert config["supports_range_requests"] is True
         assert config["supports_conditional_requests"] is True
         
+        # Connection pool limits are exposed
+        assert config["max_connections"] >= config["max_keepalive_connections"] > 0
+        assert config["keepalive_expiry"] > 0
+        assert config["streaming_mode"] == "as_available"
+        assert config["metadata_cache_ttl"] > 0
+        assert config["metadata_cache_size"] > 0
+        
         # Test URL building
         url = file_download_proxy.build_download_url("test-bucket", "path/to/file.txt")
         assert "test-bucket" in url
         assert "path/to/file.txt" in url
         assert url.startswith("http://localhost:8003")
     
+    @pytest.mark.parametrize("configured,expected", [(None, 131072), (1024, 65536), (1048576, 1048576)])
+    def test_file_download_proxy_buffer_size(self, auth_middleware, configured, expected):
+        """Test buffer size defaults to 128KB and is never configured below 64KB."""
+        from file_handlers import FileDownloadProxy
+        
+        config = Mock()
+        config.get_setting.side_effect = lambda key: {
+            "download_timeout": 300,
+            "buffer_size": configured
+        }.get(key)
+        
+        proxy = FileDownloadProxy(config_manager=config, auth_middleware=auth_middleware)
+        assert proxy.get_configuration()["buffer_size"] == expected
+    
+    @pytest.mark.asyncio
+    async def test_file_download_proxy_aclose(self, file_download_proxy):
+        """Test that aclose shuts the shared HTTP client and is idempotent."""
+        client = file_download_proxy._http_client
+        assert client.is_closed is False
+        
+        await file_download_proxy.aclose()
+        assert client.is_closed is True
+        
+        # Closing again is a no-op
+        await file_download_proxy.aclose()
+    
     def test_file_download_proxy_url_validation(self, file_download_proxy):
         """Test URL validation and sanitization."""
         # Test valid paths
         valid_paths = [
             "documents/file.txt",
             "images/photo.jpg",
-            "data/2025/report.pdf"
+            "data/2025/report.pdf",
+            "logs/console.txt"      # Reserved names only match whole segments
         ]
         
         for path in valid_paths:
@@ -423,6 +740,8 @@ class TestFileDownloadProxy:
             "file with spaces.txt",  # Unencoded spaces
             "file\x00.txt",         # Null byte
             "CON.txt",              # Windows reserved name
+            "docs/lpt1",            # Reserved name in a nested segment
+            "/etc/passwd",          # Absolute path
         ]
         
         for path in invalid_paths: